@@ -4,11 +4,19 @@
 三分钟热情项目管理系统 - Web界面
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, g, render_template, request, jsonify, send_from_directory, url_for
 from datetime import datetime, timedelta
 from decimal import Decimal
+import itertools
+import json
+import mimetypes
 import os
 import sys
+import threading
+import zlib
+
+from assets import DIST_DIR, PRECOMPRESSED_SUFFIXES, load_manifest
+from request_profiling import PROFILE_HEADER, RequestProfiler
 
 # 尝试加载.env文件（如果安装了python-dotenv）
 try:
@@ -72,10 +80,134 @@ def get_project_manager():
     return pm
 
 
+def env_flag(name):
+    """读取布尔型环境变量（1/true/yes/on视为开启）"""
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+# 进度记录写缓冲（可选，设置 PROGRESS_WRITE_BEHIND=1 开启）
+progress_buffer = None
+# 溢写文件不能被多个进程共享，没有安全的默认路径：开启写缓冲时必须显式配置，否则拒绝启动
+if env_flag('PROGRESS_WRITE_BEHIND') and not os.environ.get('PROGRESS_SPILL_FILE'):
+    raise RuntimeError("开启PROGRESS_WRITE_BEHIND时必须设置PROGRESS_SPILL_FILE（多进程部署时每个进程使用不同的文件）")
+# 多线程下只能创建一个写缓冲（每个缓冲独占溢写文件并启动自己的刷新线程）
+_progress_buffer_lock = threading.Lock()
+
+def get_progress_buffer():
+    """获取进度记录写缓冲（懒加载），未开启时返回None"""
+    global progress_buffer
+    if progress_buffer is None and env_flag('PROGRESS_WRITE_BEHIND'):
+        with _progress_buffer_lock:
+            if progress_buffer is None:
+                from write_behind import ProgressNoteBuffer
+                progress_buffer = ProgressNoteBuffer(
+                    get_project_manager(),
+                    spill_path=os.environ['PROGRESS_SPILL_FILE'],
+                    flush_size=int(os.environ.get('PROGRESS_FLUSH_SIZE', '50')),
+                    flush_interval=float(os.environ.get('PROGRESS_FLUSH_INTERVAL', '2.0'))
+                )
+                app.logger.info("已开启进度记录写缓冲")
+    return progress_buffer
+
+
+# 按需请求性能分析（可选，设置 PROFILING_ENABLED=1 开启），未开启时为None
+request_profiler = RequestProfiler.from_env()
+
+
+@app.before_request
+def start_request_profile():
+    """对带有分析令牌或被抽样的请求开启性能分析"""
+    if request_profiler is not None:
+        g.profile_session = request_profiler.start(request.headers.get(PROFILE_HEADER))
+
+
+@app.after_request
+def finish_request_profile(response):
+    """在响应发送完毕后结束分析，流式响应的生成过程也会计入"""
+    session = g.get('profile_session')
+    if session is not None:
+        if response.direct_passthrough:
+            # Werkzeug不会为direct_passthrough响应（send_file等）调用call_on_close，
+            # 这类响应不在Python中生成内容，交给teardown_request结束分析
+            g.profile_status = response.status_code
+            return response
+        g.pop('profile_session')
+        method, path = request.method, request.path
+        response.call_on_close(
+            lambda: request_profiler.finish(session, method, path, response.status_code)
+        )
+    return response
+
+
+@app.teardown_request
+def abort_request_profile(exc):
+    """结束文件响应的分析；请求异常中断、没有经过after_request时也要结束分析"""
+    session = g.pop('profile_session', None)
+    if session is not None:
+        request_profiler.finish(session, request.method, request.path, g.pop('profile_status', None))
+
+
+@app.before_first_request
+def start_progress_buffer():
+    """开启写缓冲时尽早创建，以便恢复上次崩溃前溢写文件中的记录"""
+    try:
+        get_progress_buffer()
+    except Exception as e:
+        app.logger.error(f"初始化进度记录写缓冲失败: {e}")
+
+
+# ========== 静态资源 ==========
+
+# 构建产物（manage.py build-assets）带内容哈希，可以永久缓存
+IMMUTABLE_CACHE_SECONDS = 365 * 24 * 3600
+
+# 构建生成的manifest（原文件名 -> dist下带哈希的文件名），未构建时为None
+asset_manifest = load_manifest(app.static_folder)
+
+# 渲染后的首页HTML，每个进程只渲染一次
+_index_html = None
+
+
+@app.context_processor
+def inject_asset_url():
+    """模板中使用 asset_url('script.js') 引用静态资源，已构建时指向带哈希的文件"""
+    def asset_url(filename):
+        if asset_manifest and not app.debug and filename in asset_manifest:
+            return url_for('static', filename=asset_manifest[filename])
+        return url_for('static', filename=filename)
+    return {'asset_url': asset_url}
+
+
 @app.route('/')
 def index():
     """主页"""
-    return render_template('index.html')
+    global _index_html
+    if _index_html is None or app.debug:
+        _index_html = render_template('index.html')
+    response = Response(_index_html, mimetype='text/html')
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+@app.route('/static/dist/<path:filename>')
+def dist_asset(filename):
+    """返回构建后的静态资源，优先使用预压缩文件，并设置长期不可变缓存"""
+    dist_dir = os.path.join(app.static_folder, DIST_DIR)
+    candidates = [
+        encoding for encoding, suffix in PRECOMPRESSED_SUFFIXES.items()
+        if os.path.isfile(os.path.join(dist_dir, filename + suffix))
+    ]
+    encoding = negotiate_encoding(candidates) if candidates else None
+    
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    served_name = filename + PRECOMPRESSED_SUFFIXES[encoding] if encoding else filename
+    response = send_from_directory(dist_dir, served_name, mimetype=mimetype,
+                                   cache_timeout=IMMUTABLE_CACHE_SECONDS)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_CACHE_SECONDS}, immutable'
+    return response
 
 
 @app.route('/api/incubator', methods=['GET'])
@@ -87,16 +219,7 @@ def get_incubator():
         page = request.args.get('page', type=int, default=1)
         per_page = request.args.get('per_page', type=int, default=10)
         
-        result = pm._load_json(pm.incubator_file, page=page, per_page=per_page)
-        
-        # 如果是分页结果，转换items中的Decimal
-        if isinstance(result, dict):
-            result['items'] = convert_decimals(result['items'])
-            return jsonify(result)
-        else:
-            # 兼容旧接口（无分页）
-            ideas = convert_decimals(result)
-            return jsonify(ideas)
+        return stream_project_page(pm, 'concept', page, per_page)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -139,6 +262,131 @@ def convert_decimals(obj):
     else:
         return obj
 
+
+# ========== 流式JSON响应 ==========
+
+# 原始JSON累积到该字节数后输出一个分块
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+def _json_default(obj):
+    """json.dumps的兜底转换：Decimal转为float"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"无法序列化类型: {type(obj).__name__}")
+
+
+def _dump_json(obj):
+    """按jsonify的默认输出格式序列化（键排序、紧凑分隔符、ASCII转义）"""
+    return json.dumps(obj, default=_json_default, sort_keys=True, separators=(',', ':'))
+
+
+def negotiate_encoding(supported):
+    """根据Accept-Encoding从supported（按服务端优先级排列）中选出编码，不支持则返回None"""
+    return request.accept_encodings.best_match(supported)
+
+
+def _iter_json_list(items, meta):
+    """逐条生成 {"items":[...], ...meta} 的JSON文本片段
+    
+    jsonify会对键排序，"items"排在分页字段之前，因此先输出数组再输出meta，
+    与原来的响应内容逐字节一致。
+    """
+    yield '{"items":['
+    for index, item in enumerate(items):
+        if index:
+            yield ','
+        yield _dump_json(item)
+    yield ']'
+    for key in sorted(meta):
+        yield ',' + json.dumps(key) + ':' + _dump_json(meta[key])
+    yield '}\n'
+
+
+def _encode_chunks(fragments, encoding=None):
+    """把文本片段攒成分块输出，encoding为gzip/deflate时边压缩边输出"""
+    if encoding == 'gzip':
+        compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    elif encoding == 'deflate':
+        compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS)
+    else:
+        compressor = None
+    
+    buffer = []
+    size = 0
+    for fragment in fragments:
+        data = fragment.encode('utf-8')
+        buffer.append(data)
+        size += len(data)
+        if size >= STREAM_CHUNK_SIZE:
+            chunk = b''.join(buffer)
+            buffer = []
+            size = 0
+            if compressor:
+                # 同步刷新，保证每个分块都能被客户端立即解压
+                chunk = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            yield chunk
+    
+    chunk = b''.join(buffer)
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
+
+
+def stream_json_list(items, meta):
+    """以分块JSON流式返回列表，并按Accept-Encoding协商gzip/deflate压缩
+    
+    会先取出第一条数据，使查询错误在发送响应头之前抛出，由调用方返回500。
+    """
+    items = iter(items)
+    try:
+        first = next(items)
+    except StopIteration:
+        items = iter(())
+    else:
+        items = itertools.chain([first], items)
+    
+    encoding = negotiate_encoding(['gzip', 'deflate'])
+    response = Response(_encode_chunks(_iter_json_list(items, meta), encoding),
+                        mimetype='application/json')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+
+def stream_project_page(pm, status, page, per_page, transform=None):
+    """流式返回某个状态的一页项目，响应格式与 _load_json 的分页结果相同"""
+    total = pm.count_projects(status)
+    pages = (total + per_page - 1) // per_page if per_page > 0 else 0
+    items = pm.iter_projects(status, page=page, per_page=per_page)
+    if transform:
+        items = (transform(item) for item in items)
+    return stream_json_list(items, {
+        'total': total,
+        'page': page,
+        'per_page': per_page,
+        'pages': pages
+    })
+
+
+def add_days_left(exp, now=None):
+    """为实验计算剩余天数（days_left）"""
+    now = now or datetime.now()
+    end_date_str = exp.get('end_date', '')
+    if isinstance(end_date_str, str):
+        try:
+            end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
+            exp['days_left'] = (end_date - now).days
+        except Exception as e:
+            app.logger.warning(f"解析日期失败: {end_date_str}, 错误: {e}")
+            exp['days_left'] = 0
+    else:
+        exp['days_left'] = 0
+    return exp
+
+
 @app.route('/api/experiments', methods=['GET'])
 def get_experiments():
     """获取进行中的实验列表"""
@@ -148,43 +396,12 @@ def get_experiments():
         page = request.args.get('page', type=int, default=1)
         per_page = request.args.get('per_page', type=int, default=10)
         
-        result = pm._load_json(pm.active_file, page=page, per_page=per_page)
-        
-        # 判断是分页结果还是列表结果
-        if isinstance(result, dict):
-            experiments = result['items']
-            is_paginated = True
-        else:
-            experiments = result
-            is_paginated = False
-        
-        # MySQL版本已经通过SQL查询过滤了active状态
-        # 计算剩余天数
+        # MySQL版本已经通过SQL查询过滤了active状态，逐条计算剩余天数
         now = datetime.now()
-        for exp in experiments:
-            end_date_str = exp.get('end_date', '')
-            if isinstance(end_date_str, str):
-                try:
-                    end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
-                    days_left = (end_date - now).days
-                    exp['days_left'] = days_left
-                except Exception as e:
-                    app.logger.warning(f"解析日期失败: {end_date_str}, 错误: {e}")
-                    exp['days_left'] = 0
-            else:
-                exp['days_left'] = 0
-        
-        # 确保所有Decimal类型都被转换
-        experiments = convert_decimals(experiments)
-        
-        app.logger.info(f"返回 {len(experiments)} 个进行中的实验")
-        
-        # 如果是分页结果，返回分页格式
-        if is_paginated:
-            result['items'] = experiments
-            return jsonify(result)
-        else:
-            return jsonify(experiments)
+        response = stream_project_page(pm, 'active', page, per_page,
+                                       transform=lambda exp: add_days_left(exp, now))
+        app.logger.info(f"开始返回第 {page} 页进行中的实验")
+        return response
     except Exception as e:
         import traceback
         error_msg = traceback.format_exc()
@@ -233,6 +450,11 @@ def add_progress(exp_id):
         data = request.json
         note = data.get('note', '')
         if note:
+            buffer = get_progress_buffer()
+            if buffer:
+                # 写缓冲模式：入队后立即确认，由后台线程批量写入
+                buffer.enqueue(exp_id, note)
+                return jsonify({'success': True, 'queued': True})
             pm = get_project_manager()
             pm.add_progress_note(exp_id, note)
             return jsonify({'success': True})
@@ -251,12 +473,18 @@ def complete_experiment(exp_id):
         connection = data.get('connection', '')
         
         pm = get_project_manager()
+        buffer = get_progress_buffer()
+        if buffer:
+            # 归档前先写入已确认的进度记录，否则刷新时实验已不在进行中，记录会被丢弃
+            buffer.flush()
         archive_id = pm.complete_experiment(
             exp_id,
             skill_learned=skill,
             experience=experience,
             connection=connection
         )
+        if buffer:
+            buffer.forget(exp_id)
         return jsonify({'success': True, 'id': archive_id})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -271,16 +499,7 @@ def get_archive():
         page = request.args.get('page', type=int, default=1)
         per_page = request.args.get('per_page', type=int, default=10)
         
-        result = pm._load_json(pm.archive_file, page=page, per_page=per_page)
-        
-        # 如果是分页结果，转换items中的Decimal
-        if isinstance(result, dict):
-            result['items'] = convert_decimals(result['items'])
-            return jsonify(result)
-        else:
-            # 兼容旧接口（无分页）
-            archive = convert_decimals(result)
-            return jsonify(archive)
+        return stream_project_page(pm, 'archived', page, per_page)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -290,8 +509,7 @@ def get_archive_item(archive_id):
     """获取单个归档项目详情"""
     try:
         pm = get_project_manager()
-        archive = pm._load_json(pm.archive_file)
-        item = next((a for a in archive if a['id'] == archive_id), None)
+        item = pm.get_project(archive_id, 'archived')
         if item:
             item = convert_decimals(item)
             return jsonify(item)
@@ -305,9 +523,8 @@ def delete_archive_item(archive_id):
     """删除归档项目"""
     try:
         pm = get_project_manager()
-        # MySQL版本：直接删除数据库记录（使用统一的projects表）
-        sql = "DELETE FROM projects WHERE id = %s AND status = 'archived'"
-        pm._execute_query(sql, (archive_id,), fetch=False)
+        # 同时删除热数据（projects表）和冷数据（projects_archive表）
+        pm.delete_archived_project(archive_id)
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -318,20 +535,14 @@ def get_experiment(exp_id):
     """获取单个实验详情"""
     try:
         pm = get_project_manager()
-        experiments = pm._load_json(pm.active_file)
-        exp = next((e for e in experiments if e['id'] == exp_id), None)
+        exp = pm.get_project(exp_id, 'active')
         if exp:
+            # 补上写缓冲中尚未落库的进度记录
+            buffer = get_progress_buffer()
+            if buffer:
+                exp['progress_notes'].extend(buffer.pending_notes(exp_id))
             # 计算剩余天数
-            end_date_str = exp.get('end_date', '')
-            if isinstance(end_date_str, str):
-                try:
-                    end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
-                    days_left = (end_date - datetime.now()).days
-                    exp['days_left'] = days_left
-                except:
-                    exp['days_left'] = 0
-            else:
-                exp['days_left'] = 0
+            exp = add_days_left(exp)
             exp = convert_decimals(exp)
             return jsonify(exp)
         return jsonify({'error': '未找到实验'}), 404
@@ -352,9 +563,132 @@ def get_stats():
         return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500
 
 
+@app.route('/api/stats/timeline', methods=['GET'])
+def get_stats_timeline():
+    """获取活动时间序列（进度记录数、启动/完成实验数）
+    
+    参数: granularity=day|week|month（默认day），start、end为YYYY-MM-DD（默认最近一年）
+    """
+    try:
+        granularity = request.args.get('granularity', 'day')
+        try:
+            end = datetime.strptime(request.args['end'], '%Y-%m-%d').date() if request.args.get('end') else datetime.now().date()
+            start = datetime.strptime(request.args['start'], '%Y-%m-%d').date() if request.args.get('start') else end - timedelta(days=364)
+        except ValueError:
+            return jsonify({'error': '日期格式应为YYYY-MM-DD'}), 400
+        if start > end:
+            return jsonify({'error': '开始日期不能晚于结束日期'}), 400
+        
+        pm = get_project_manager()
+        try:
+            # 首尾扩展到完整的周/月，返回实际统计的范围
+            start, end = pm.align_timeline_range(granularity, start, end)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        series = pm.get_activity_timeline(granularity, start, end)
+        return jsonify({
+            'granularity': granularity,
+            'start': start.strftime('%Y-%m-%d'),
+            'end': end.strftime('%Y-%m-%d'),
+            'series': series
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ========== 增量同步 ==========
+
+# 新令牌比当前时间提前的秒数：覆盖已取得时间戳但尚未提交的写入，重叠部分客户端按ID合并
+SYNC_OVERLAP_SECONDS = 5
+# 删除标记的保留天数，更早的令牌无法保证拿到全部删除，客户端需全量刷新
+SYNC_TOMBSTONE_DAYS = int(os.environ.get('SYNC_TOMBSTONE_DAYS', '30'))
+# 单次增量同步每类变化的最大条数，超过时让客户端全量刷新
+SYNC_MAX_CHANGES = 500
+
+
+def encode_sync_token(moment):
+    """把时间编码为同步令牌（秒级时间戳）"""
+    return str(int(moment.timestamp()))
+
+
+def decode_sync_token(token):
+    """解析同步令牌，格式不正确时抛出ValueError"""
+    return datetime.fromtimestamp(int(token))
+
+
+@app.route('/api/changes', methods=['GET'])
+def get_changes():
+    """获取自 since 令牌以来变化的项目、进度记录和删除标记
+    
+    不带since或令牌过旧、变化过多时返回 reset=true，客户端应全量刷新后使用新令牌。
+    """
+    try:
+        now = datetime.now()
+        synced_until = now - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+        buffer = get_progress_buffer()
+        if buffer:
+            # 写缓冲中的进度记录在入队时就确定了时间，要等刷新后才可见，
+            # 令牌不能越过最早一条尚未写入的记录（刷新失败时令牌会停在原处，直到写入成功）
+            oldest = buffer.oldest_pending()
+            if oldest is not None:
+                synced_until = min(synced_until, oldest)
+        token = encode_sync_token(synced_until)
+        
+        since_token = request.args.get('since')
+        if not since_token:
+            return jsonify({'token': token, 'reset': True})
+        try:
+            since = decode_sync_token(since_token)
+        except (ValueError, OverflowError, OSError):
+            return jsonify({'error': '无效的同步令牌'}), 400
+        if since < now - timedelta(days=SYNC_TOMBSTONE_DAYS):
+            return jsonify({'token': token, 'reset': True})
+        
+        pm = get_project_manager()
+        changes = pm.get_changes(since, limit=SYNC_MAX_CHANGES)
+        if changes is None:
+            return jsonify({'token': token, 'reset': True})
+        
+        for project in changes['projects']:
+            if project.get('status') == 'active':
+                add_days_left(project, now)
+        changes = convert_decimals(changes)
+        changes.update({'token': token, 'reset': False})
+        return jsonify(changes)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/progress-buffer/stats', methods=['GET'])
+def get_progress_buffer_stats():
+    """获取进度记录写缓冲的吞吐量和刷新延迟统计"""
+    try:
+        buffer = get_progress_buffer()
+        if not buffer:
+            return jsonify({'enabled': False})
+        return jsonify(buffer.stats())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/debug/profiles', methods=['GET'])
+def get_request_profiles():
+    """查看最近的请求性能分析结果（需要 X-Profile-Token 请求头）"""
+    if request_profiler is None:
+        return jsonify({'error': '未开启性能分析'}), 404
+    if not request_profiler.check_token(request.headers.get(PROFILE_HEADER)):
+        return jsonify({'error': '无权访问'}), 403
+    return jsonify({'profiles': request_profiler.profiles()})
+
+
 # 如果直接运行此文件，启动开发服务器
 # 根据腾讯云文档：Web Function必须监听0.0.0.0:9000
 if __name__ == '__main__':
+    if env_flag('PROGRESS_WRITE_BEHIND'):
+        # 收到SIGTERM时正常退出，让atexit刷新写缓冲
+        import signal
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
     # Serverless环境：监听0.0.0.0:9000
     # 本地开发：监听127.0.0.1:9000
     if os.environ.get('TENCENTCLOUD_RUNENV') or os.environ.get('SCF_RUNTIME'):
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+三分钟热情项目管理系统 - 静态资源构建
+
+把 static/ 下的 script.js、style.css 压缩并按内容哈希重命名，输出到 static/dist/，
+同时生成预压缩的 .gz（以及安装了brotli时的 .br）文件和 manifest.json。
+文件名随内容变化，因此可以使用长期不可变缓存。
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    # brotli是可选依赖，未安装时只生成gzip预压缩文件
+    BROTLI_AVAILABLE = False
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+
+# 需要构建的静态资源（相对于static目录）
+ASSETS = ('script.js', 'style.css')
+
+# 预压缩文件的扩展名
+PRECOMPRESSED_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+# ========== 压缩 ==========
+
+def minify_css(source: str) -> str:
+    """压缩CSS：去掉注释和多余空白"""
+    css = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    # 冒号前的空格在选择器中有意义（如 "a :hover"），只去掉冒号后的空格
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    return css.strip()
+
+
+# 这些字符前后的空白可以安全去掉（不含+、-，避免 "a + +b" 被合并成 "a++b"）
+_JS_PUNCTUATION = set('{}()[];,:=<>!?&|*%')
+# 这些字符之后的换行不会影响自动分号插入
+_JS_NEWLINE_SAFE_AFTER = set('{[(;,')
+
+
+def minify_js(source: str) -> str:
+    """保守地压缩JavaScript：去掉注释、合并空白，字符串和模板字符串保持原样
+
+    只做词法层面的处理，保留可能影响自动分号插入的换行。
+    不识别正则表达式字面量，script.js 中也没有使用。
+    """
+    out = []
+    _scan_js_code(source, 0, out, stop_at_brace=False)
+    return ''.join(out).strip()
+
+
+def _emit_js_whitespace(out, has_newline: bool, next_char: str):
+    """在代码中输出一段空白：能省略则省略，否则保留一个空格或换行"""
+    prev_char = out[-1][-1] if out and out[-1] else ''
+    if not prev_char or not next_char:
+        return
+    if has_newline and prev_char not in _JS_NEWLINE_SAFE_AFTER and next_char not in ')]}':
+        out.append('\n')
+    elif prev_char in _JS_PUNCTUATION or next_char in _JS_PUNCTUATION:
+        return
+    else:
+        out.append(' ')
+
+
+def _scan_js_code(source: str, i: int, out, stop_at_brace: bool) -> int:
+    """扫描代码部分，stop_at_brace为True时扫描到匹配的 } 为止（模板字符串中的 ${...}）"""
+    n = len(source)
+    depth = 0
+    while i < n:
+        c = source[i]
+        if c.isspace() or source.startswith('//', i) or source.startswith('/*', i):
+            # 空白和注释统一视为一段空白
+            has_newline = False
+            while i < n:
+                if source[i].isspace():
+                    has_newline = has_newline or source[i] == '\n'
+                    i += 1
+                elif source.startswith('//', i):
+                    end = source.find('\n', i)
+                    i = n if end == -1 else end
+                elif source.startswith('/*', i):
+                    end = source.find('*/', i + 2)
+                    i = n if end == -1 else end + 2
+                    has_newline = True
+                else:
+                    break
+            _emit_js_whitespace(out, has_newline, source[i] if i < n else '')
+        elif c in '"\'':
+            j = i + 1
+            while j < n and source[j] != c:
+                j += 2 if source[j] == '\\' else 1
+            out.append(source[i:j + 1])
+            i = j + 1
+        elif c == '`':
+            i = _scan_js_template(source, i, out)
+        else:
+            if c == '{':
+                depth += 1
+            elif c == '}':
+                if stop_at_brace and depth == 0:
+                    out.append(c)
+                    return i + 1
+                depth -= 1
+            out.append(c)
+            i += 1
+    return i
+
+
+def _scan_js_template(source: str, i: int, out) -> int:
+    """原样复制模板字符串，${...} 中的代码递归压缩"""
+    n = len(source)
+    out.append('`')
+    i += 1
+    start = i
+    while i < n:
+        c = source[i]
+        if c == '\\':
+            i += 2
+        elif c == '`':
+            out.append(source[start:i + 1])
+            return i + 1
+        elif source.startswith('${', i):
+            out.append(source[start:i + 2])
+            i = _scan_js_code(source, i + 2, out, stop_at_brace=True)
+            start = i
+        else:
+            i += 1
+    out.append(source[start:])
+    return n
+
+
+_MINIFIERS = {
+    '.js': minify_js,
+    '.css': minify_css,
+}
+
+
+# ========== 构建 ==========
+
+def _write_bytes(path: str, data: bytes):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _gzip_bytes(data: bytes) -> bytes:
+    """gzip压缩，mtime固定为0，保证相同内容生成相同的.gz文件
+
+    gzip.compress 的 mtime 参数需要Python 3.8+，这里用GzipFile以兼容Python 3.6。
+    """
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=9, mtime=0) as f:
+        f.write(data)
+    return buffer.getvalue()
+
+
+def build_assets(static_dir: str = STATIC_DIR) -> Dict[str, str]:
+    """构建静态资源，返回manifest（原文件名 -> dist下带哈希的文件名）"""
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    os.makedirs(dist_dir, exist_ok=True)
+
+    manifest = {}
+    for name in ASSETS:
+        with open(os.path.join(static_dir, name), 'r', encoding='utf-8') as f:
+            source = f.read()
+
+        base, ext = os.path.splitext(name)
+        data = _MINIFIERS[ext](source).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        filename = f"{base}.{digest}.min{ext}"
+        path = os.path.join(dist_dir, filename)
+
+        _write_bytes(path, data)
+        _write_bytes(path + PRECOMPRESSED_SUFFIXES['gzip'], _gzip_bytes(data))
+        if BROTLI_AVAILABLE:
+            _write_bytes(path + PRECOMPRESSED_SUFFIXES['br'], brotli.compress(data))
+
+        manifest[name] = f"{DIST_DIR}/{filename}"
+        logger.info(f"{name}: {len(source.encode('utf-8'))} -> {len(data)} 字节 ({manifest[name]})")
+
+    with open(os.path.join(dist_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def load_manifest(static_dir: str = STATIC_DIR) -> Optional[Dict[str, str]]:
+    """读取构建生成的manifest，未构建时返回None"""
+    path = os.path.join(static_dir, DIST_DIR, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -10,6 +10,7 @@ USE `threemins`;
 
 -- 统一的项目表（替代原来的incubator、active_experiments、archive三个表）
 -- 通过status字段区分：'concept'（概念/孵化池）、'active'（进行中实验）、'archived'（已归档）
+-- 'tiered'为已迁移到projects_archive的项目留下的占位行（不含文本），用于保留其id
 CREATE TABLE IF NOT EXISTS `projects` (
     `id` INT AUTO_INCREMENT PRIMARY KEY,
     `idea` TEXT NOT NULL COMMENT '想法内容',
@@ -23,15 +24,19 @@ CREATE TABLE IF NOT EXISTS `projects` (
     `skill_learned` TEXT COMMENT '学到的技能（归档阶段使用）',
     `experience` TEXT COMMENT '过程体验（归档阶段使用）',
     `connection` TEXT COMMENT '连接可能性（归档阶段使用）',
-    `status` VARCHAR(20) NOT NULL DEFAULT 'concept' COMMENT '状态：concept-概念/孵化池, active-进行中实验, archived-已归档',
+    `status` VARCHAR(20) NOT NULL DEFAULT 'concept' COMMENT '状态：concept-概念/孵化池, active-进行中实验, archived-已归档, tiered-已迁移到冷数据表的占位行',
     `created_at` DATETIME NOT NULL COMMENT '创建时间',
     `updated_at` DATETIME NOT NULL COMMENT '更新时间',
     INDEX `idx_status` (`status`),
     INDEX `idx_created_at` (`created_at`),
     INDEX `idx_end_date` (`end_date`),
-    INDEX `idx_completed_at` (`completed_at`)
+    INDEX `idx_completed_at` (`completed_at`),
+    INDEX `idx_updated_at` (`updated_at`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='统一项目表';
 
+-- 已有数据库升级时需手动补充索引（增量同步 /api/changes 按updated_at范围查询）：
+-- ALTER TABLE `projects` ADD INDEX `idx_updated_at` (`updated_at`);
+
 -- 进度记录表（统一引用projects表）
 CREATE TABLE IF NOT EXISTS `progress_notes` (
     `id` INT AUTO_INCREMENT PRIMARY KEY,
@@ -42,3 +47,54 @@ CREATE TABLE IF NOT EXISTS `progress_notes` (
     INDEX `idx_project_id` (`project_id`),
     INDEX `idx_created_at` (`created_at`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='项目进度记录';
+
+-- 归档冷数据表（分层存储）
+-- 完成时间早于 ARCHIVE_TIER_DAYS 天的归档项目由 `python manage.py tier-archive` 从projects表迁移到这里，
+-- 其进度记录压缩为一个BLOB，使孵化池/进行中实验的查询不再与多年的归档数据共享缓冲池和索引页。
+-- id沿用原projects表的ID，/api/archive 和 /api/archive/<id> 会透明地合并两张表。
+-- projects表中保留status='tiered'的占位行：MySQL 8.0之前重启后AUTO_INCREMENT会重置为MAX(id)+1，
+-- 占位行保证这些id不会被新项目重新使用。
+CREATE TABLE IF NOT EXISTS `projects_archive` (
+    `id` INT PRIMARY KEY COMMENT '原projects表ID',
+    `idea` TEXT NOT NULL COMMENT '想法内容',
+    `notes` TEXT COMMENT '备注',
+    `goal` TEXT COMMENT '目标',
+    `budget` DECIMAL(10, 2) DEFAULT 0.00 COMMENT '预算',
+    `start_date` DATE COMMENT '开始日期',
+    `end_date` DATE COMMENT '结束日期',
+    `duration_days` INT DEFAULT 21 COMMENT '持续天数',
+    `completed_at` DATETIME COMMENT '完成时间',
+    `skill_learned` TEXT COMMENT '学到的技能',
+    `experience` TEXT COMMENT '过程体验',
+    `connection` TEXT COMMENT '连接可能性',
+    `created_at` DATETIME NOT NULL COMMENT '创建时间',
+    `updated_at` DATETIME NOT NULL COMMENT '更新时间',
+    `progress_notes_blob` MEDIUMBLOB COMMENT '进度记录（zlib压缩的JSON数组）',
+    `tiered_at` DATETIME NOT NULL COMMENT '迁移到冷数据表的时间',
+    INDEX `idx_completed_at` (`completed_at`)
+) ENGINE=InnoDB ROW_FORMAT=COMPRESSED DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='归档项目冷数据表';
+
+-- 之前迁移时直接删除了projects表中的原行，升级时需为已迁移的项目补上占位行：
+-- INSERT INTO `projects` (`id`, `idea`, `status`, `created_at`, `updated_at`)
+-- SELECT `id`, '', 'tiered', `created_at`, `updated_at` FROM `projects_archive`
+-- WHERE `id` NOT IN (SELECT `id` FROM `projects`);
+
+-- 每日活动汇总表（供 /api/stats/timeline 使用）
+-- 添加进度记录、启动实验、完成实验时在同一事务中累加当天的计数；
+-- 已有数据可用 `python manage.py backfill-rollups` 重建
+CREATE TABLE IF NOT EXISTS `activity_daily` (
+    `day` DATE PRIMARY KEY COMMENT '日期',
+    `notes_added` INT NOT NULL DEFAULT 0 COMMENT '当天添加的进度记录数',
+    `experiments_started` INT NOT NULL DEFAULT 0 COMMENT '当天启动的实验数',
+    `experiments_completed` INT NOT NULL DEFAULT 0 COMMENT '当天完成的实验数'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='每日活动汇总';
+
+-- 删除标记表（供增量同步 /api/changes 告知客户端哪些项目已被删除）
+-- 超过 SYNC_TOMBSTONE_DAYS 天的标记可用 `python manage.py purge-tombstones` 清理
+CREATE TABLE IF NOT EXISTS `deleted_records` (
+    `id` INT AUTO_INCREMENT PRIMARY KEY,
+    `entity` VARCHAR(20) NOT NULL COMMENT '被删除记录的类型：project',
+    `entity_id` INT NOT NULL COMMENT '被删除记录的ID',
+    `deleted_at` DATETIME NOT NULL COMMENT '删除时间',
+    INDEX `idx_deleted_at` (`deleted_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='删除标记';
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+三分钟热情项目管理系统 - 运维命令行工具
+
+用法:
+    python manage.py tier-archive [--days 180] [--batch-size 100] [--measure]
+    python manage.py build-assets
+    python manage.py backfill-rollups
+    python manage.py purge-tombstones [--days 30]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from app import get_project_manager
+from assets import build_assets as build_static_assets
+
+
+def measure_hot_queries(pm, repeat: int = 20):
+    """测量热数据路径（孵化池、进行中实验、统计）的查询延迟，返回 {名称: 中位数毫秒}"""
+    queries = {
+        'concept_page': lambda: list(pm.iter_projects('concept', page=1, per_page=10)),
+        'active_page': lambda: list(pm.iter_projects('active', page=1, per_page=10)),
+        'concept_count': lambda: pm.count_projects('concept'),
+        'active_count': lambda: pm.count_projects('active'),
+    }
+    results = {}
+    for name, query in queries.items():
+        query()  # 预热
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query()
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        results[name] = timings[len(timings) // 2]
+    return results
+
+
+def tier_archive(args):
+    """把旧的归档项目迁移到冷数据表"""
+    pm = get_project_manager()
+    before = measure_hot_queries(pm) if args.measure else None
+    
+    moved = pm.tier_archived_projects(older_than_days=args.days, batch_size=args.batch_size)
+    print(f"已将 {moved} 个完成超过 {args.days} 天的归档项目迁移到冷数据表")
+    
+    if args.measure:
+        after = measure_hot_queries(pm)
+        print(f"{'查询':<16}{'迁移前(ms)':>12}{'迁移后(ms)':>12}")
+        for name in before:
+            print(f"{name:<16}{before[name]:>12.2f}{after[name]:>12.2f}")
+    return 0
+
+
+def build_assets(args):
+    """压缩静态资源并生成带内容哈希的文件和预压缩文件"""
+    manifest = build_static_assets()
+    for name, built in sorted(manifest.items()):
+        print(f"{name} -> static/{built}")
+    return 0
+
+
+def backfill_rollups(args):
+    """根据现有数据重建每日活动汇总表"""
+    pm = get_project_manager()
+    days = pm.backfill_activity_rollups()
+    print(f"活动统计重建完成，共 {days} 天")
+    return 0
+
+
+def purge_tombstones(args):
+    """清理过期的删除标记"""
+    pm = get_project_manager()
+    purged = pm.purge_tombstones(args.days)
+    print(f"已清理 {purged} 条超过 {args.days} 天的删除标记")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='三分钟热情项目管理系统 - 运维命令')
+    subparsers = parser.add_subparsers(dest='command')
+    
+    tier_parser = subparsers.add_parser('tier-archive', help='把旧的归档项目迁移到冷数据表')
+    tier_parser.add_argument('--days', type=int, default=int(os.environ.get('ARCHIVE_TIER_DAYS', '180')),
+                             help='迁移完成超过多少天的归档项目（默认读取ARCHIVE_TIER_DAYS，否则180）')
+    tier_parser.add_argument('--batch-size', type=int, default=100, help='每个事务迁移的项目数')
+    tier_parser.add_argument('--measure', action='store_true', help='迁移前后测量热数据查询延迟')
+    tier_parser.set_defaults(func=tier_archive)
+    
+    assets_parser = subparsers.add_parser('build-assets', help='压缩静态资源并生成带哈希的文件（部署前执行）')
+    assets_parser.set_defaults(func=build_assets)
+    
+    rollups_parser = subparsers.add_parser('backfill-rollups', help='根据现有数据重建每日活动汇总表')
+    rollups_parser.set_defaults(func=backfill_rollups)
+    
+    tombstones_parser = subparsers.add_parser('purge-tombstones', help='清理过期的删除标记（增量同步使用）')
+    tombstones_parser.add_argument('--days', type=int, default=int(os.environ.get('SYNC_TOMBSTONE_DAYS', '30')),
+                                   help='清理多少天前的删除标记（默认读取SYNC_TOMBSTONE_DAYS，否则30）')
+    tombstones_parser.set_defaults(func=purge_tombstones)
+    
+    args = parser.parse_args(argv)
+    if not args.command:
+        parser.print_help()
+        return 1
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,7 +6,10 @@
 通过status字段区分：'concept'（概念）、'active'（实验）、'archived'（存档）
 """
 
+import calendar
+import json
 import logging
+import zlib
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from decimal import Decimal
@@ -21,6 +24,25 @@ except ImportError:
     logger.warning("PyMySQL未安装，无法使用MySQL存储")
 
 
+# projects表中除status外的业务字段（冷数据表projects_archive使用相同字段）
+PROJECT_COLUMNS = (
+    'id', 'idea', 'notes', 'goal', 'budget', 'start_date', 'end_date', 'duration_days',
+    'completed_at', 'skill_learned', 'experience', 'connection', 'created_at', 'updated_at'
+)
+
+
+def pack_progress_notes(notes: List[Dict]) -> bytes:
+    """把进度记录列表压缩为一个BLOB（zlib压缩的JSON数组）"""
+    return zlib.compress(json.dumps(notes, ensure_ascii=False).encode('utf-8'), 9)
+
+
+def unpack_progress_notes(blob) -> List[Dict]:
+    """解压 pack_progress_notes 生成的BLOB"""
+    if not blob:
+        return []
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
 class ProjectManagerMySQL:
     """项目管理核心类 - MySQL数据库版本（使用统一projects表）"""
     
@@ -88,6 +110,55 @@ class ProjectManagerMySQL:
             if conn:
                 conn.close()
     
+    def _execute_transaction(self, statements: List[tuple]) -> List[int]:
+        """在同一个事务中依次执行多条SQL，返回每条语句的lastrowid
+        
+        Args:
+            statements: [(sql, params), ...]
+        """
+        conn = None
+        try:
+            conn = self._get_connection()
+            row_ids = []
+            with conn.cursor() as cursor:
+                for sql, params in statements:
+                    cursor.execute(sql, params)
+                    row_ids.append(cursor.lastrowid)
+            conn.commit()
+            return row_ids
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"事务执行失败: {statements}, 错误: {e}")
+            raise
+        finally:
+            if conn:
+                conn.close()
+    
+    def _execute_status_change(self, sql: str, params: tuple, follow_up: List[tuple], error: str):
+        """在同一个事务中执行带状态条件的UPDATE，恰好更新一行时才继续执行follow_up中的语句
+        
+        并发请求中只有一个能更新成功，其余的回滚并抛出ValueError(error)，避免重复累加统计。
+        """
+        conn = None
+        try:
+            conn = self._get_connection()
+            with conn.cursor() as cursor:
+                if cursor.execute(sql, params) != 1:
+                    raise ValueError(error)
+                for follow_sql, follow_params in follow_up:
+                    cursor.execute(follow_sql, follow_params)
+            conn.commit()
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            if not isinstance(e, ValueError):
+                logger.error(f"状态更新失败: {sql}, 参数: {params}, 错误: {e}")
+            raise
+        finally:
+            if conn:
+                conn.close()
+    
     # ========== 兴趣孵化池操作 ==========
     
     def add_to_incubator(self, idea: str, notes: str = ""):
@@ -107,131 +178,286 @@ class ProjectManagerMySQL:
     
     def remove_from_incubator(self, idea_id: int):
         """从兴趣孵化池移除想法"""
-        sql = "DELETE FROM projects WHERE id = %s AND status = 'concept'"
-        self._execute_query(sql, (idea_id,), fetch=False)
+        self._execute_transaction([
+            # 先记录删除标记（供增量同步使用），只有确实会被删除的行才记录
+            self._tombstone_statement("FROM projects WHERE id = %s AND status = 'concept'", (idea_id,)),
+            ("DELETE FROM projects WHERE id = %s AND status = 'concept'", (idea_id,))
+        ])
         logger.info(f"成功移除想法 ID: {idea_id}")
     
-    def _load_json(self, table_name_or_path, page: int = None, per_page: int = None) -> List:
-        """从数据库表加载数据（兼容原有接口）
-        
-        Args:
-            table_name_or_path: 表名或路径
-            page: 页码（从1开始），如果为None则返回所有数据
-            per_page: 每页数量，如果为None则返回所有数据
-        
-        Returns:
-            如果指定了分页参数，返回字典 {'items': [...], 'total': 总数, 'page': 页码, 'per_page': 每页数量, 'pages': 总页数}
-            否则返回列表（兼容旧接口）
+    def _tombstone_statement(self, from_where: str, params: tuple) -> tuple:
+        """生成为即将删除的项目记录删除标记的SQL，from_where形如 "FROM projects WHERE ..." """
+        sql = f"""
+            INSERT INTO deleted_records (entity, entity_id, deleted_at)
+            SELECT 'project', id, %s {from_where}
         """
-        # 兼容原有接口：可能传入文件路径，需要转换为状态
+        return sql, (datetime.now(),) + params
+    
+    # 各状态列表的排序方式
+    _STATUS_ORDER_BY = {
+        'concept': 'created_at DESC',
+        'active': 'created_at DESC',
+        'archived': 'completed_at DESC, created_at DESC',
+    }
+    
+    def _resolve_status(self, table_name_or_path) -> Optional[str]:
+        """把兼容接口传入的表名/路径转换为projects表的状态值"""
         if isinstance(table_name_or_path, str):
             if 'incubator' in table_name_or_path:
-                status = 'concept'
+                return 'concept'
             elif 'active_experiments' in table_name_or_path:
-                status = 'active'
+                return 'active'
             elif 'archive' in table_name_or_path:
-                status = 'archived'
-            else:
-                # 如果直接传入状态值
-                status = table_name_or_path if table_name_or_path in ['concept', 'active', 'archived'] else None
-        else:
-            status = table_name_or_path if table_name_or_path in ['concept', 'active', 'archived'] else None
-        
-        if status is None:
-            return [] if page is None else {'items': [], 'total': 0, 'page': 1, 'per_page': per_page or 10, 'pages': 0}
-        
-        # 先查询总数
+                return 'archived'
+        # 如果直接传入状态值
+        return table_name_or_path if table_name_or_path in ['concept', 'active', 'archived'] else None
+    
+    def count_projects(self, status: str) -> int:
+        """统计指定状态的项目数量（archived包含冷数据表中的项目）"""
         count_sql = "SELECT COUNT(*) as total FROM projects WHERE status = %s"
         total_result = self._execute_query(count_sql, (status,))
         total = total_result[0]['total'] if total_result else 0
+        if status == 'archived':
+            total += self.count_cold_archive()
+        return total
+    
+    def count_cold_archive(self) -> int:
+        """统计已迁移到冷数据表的归档项目数量"""
+        cold_result = self._execute_query("SELECT COUNT(*) as total FROM projects_archive")
+        return cold_result[0]['total'] if cold_result else 0
+    
+    def _format_project_row(self, row) -> Dict:
+        """把projects表的一行转换为JSON格式（兼容原有格式）"""
+        item = dict(row)
         
-        # 根据状态查询projects表
-        if status == 'concept':
-            base_sql = """
-                SELECT * FROM projects 
-                WHERE status = 'concept' 
-                ORDER BY created_at DESC
-            """
-        elif status == 'active':
-            base_sql = """
-                SELECT * FROM projects 
-                WHERE status = 'active' 
-                ORDER BY created_at DESC
-            """
-        elif status == 'archived':
-            base_sql = """
-                SELECT * FROM projects 
-                WHERE status = 'archived' 
-                ORDER BY completed_at DESC, created_at DESC
-            """
-        else:
-            return [] if page is None else {'items': [], 'total': 0, 'page': 1, 'per_page': per_page or 10, 'pages': 0}
+        # 转换Decimal类型为float（用于JSON序列化）
+        for key, value in item.items():
+            if isinstance(value, Decimal):
+                item[key] = float(value)
         
-        # 如果指定了分页参数，添加LIMIT和OFFSET
-        if page is not None and per_page is not None:
-            offset = (page - 1) * per_page
-            sql = f"{base_sql} LIMIT {per_page} OFFSET {offset}"
-        else:
-            sql = base_sql
+        # 转换日期格式为字符串
+        for key in ['created_at', 'updated_at', 'completed_at', 'start_date', 'end_date']:
+            if key in item and item[key]:
+                if isinstance(item[key], datetime):
+                    if key in ['start_date', 'end_date']:
+                        item[key] = item[key].strftime('%Y-%m-%d')
+                    else:
+                        item[key] = item[key].strftime('%Y-%m-%d %H:%M:%S')
+                elif hasattr(item[key], 'strftime'):
+                    # date对象
+                    if key in ['start_date', 'end_date']:
+                        item[key] = item[key].strftime('%Y-%m-%d')
+                    else:
+                        item[key] = item[key].strftime('%Y-%m-%d %H:%M:%S')
+                elif isinstance(item[key], str):
+                    # 已经是字符串格式，确保格式正确
+                    if key in ['start_date', 'end_date'] and len(item[key]) > 10:
+                        try:
+                            dt = datetime.strptime(item[key], '%Y-%m-%d %H:%M:%S')
+                            item[key] = dt.strftime('%Y-%m-%d')
+                        except:
+                            pass
         
-        rows = self._execute_query(sql)
-        logger.info(f"从projects表查询到 {len(rows)} 条状态为 '{status}' 的记录（总数: {total}）")
+        return item
+    
+    def _load_progress_notes(self, conn, project_ids: List[int]) -> Dict[int, List[Dict]]:
+        """一次查询批量加载多个项目的进度记录，返回 {project_id: [{'date', 'note'}, ...]}"""
+        notes = {}
+        if not project_ids:
+            return notes
         
-        # 转换为JSON格式（兼容原有格式）
-        result = []
-        for row in rows:
-            item = dict(row)
-            project_id = item['id']
-            
-            # 查询进度记录（统一使用progress_notes表）
-            progress_sql = """
-                SELECT created_at, note
-                FROM progress_notes
-                WHERE project_id = %s
-                ORDER BY created_at ASC
-            """
-            progress_rows = self._execute_query(progress_sql, (project_id,))
-            item['progress_notes'] = []
-            for p_row in progress_rows:
+        placeholders = ', '.join(['%s'] * len(project_ids))
+        progress_sql = f"""
+            SELECT project_id, created_at, note
+            FROM progress_notes
+            WHERE project_id IN ({placeholders})
+            ORDER BY created_at ASC, id ASC
+        """
+        with conn.cursor() as cursor:
+            cursor.execute(progress_sql, tuple(project_ids))
+            for p_row in cursor.fetchall():
                 created_at = p_row['created_at']
                 if isinstance(created_at, datetime):
                     date_str = created_at.strftime('%Y-%m-%d %H:%M:%S')
                 else:
                     date_str = str(created_at)
-                item['progress_notes'].append({
+                notes.setdefault(p_row['project_id'], []).append({
                     'date': date_str,
                     'note': p_row['note']
                 })
+        return notes
+    
+    def _archive_union_sql(self, hot_where: str = "", cold_where: str = None) -> str:
+        """归档项目查询：合并projects表（热数据）和projects_archive表（冷数据）
+        
+        结果中的tier列标识来源，冷数据的进度记录在progress_notes_blob列中。
+        cold_where为None时与hot_where相同。
+        """
+        if cold_where is None:
+            cold_where = hot_where
+        columns = ', '.join(PROJECT_COLUMNS)
+        return f"""
+            SELECT {columns}, 'archived' AS status, 'hot' AS tier, NULL AS progress_notes_blob
+            FROM projects WHERE status = 'archived' {hot_where}
+            UNION ALL
+            SELECT {columns}, 'archived' AS status, 'cold' AS tier, progress_notes_blob
+            FROM projects_archive WHERE 1 = 1 {cold_where}
+        """
+    
+    # 归档项目排序分页用的轻量查询：只包含排序字段，不读取大字段和BLOB
+    _ARCHIVE_KEYS_SQL = """
+        SELECT id, tier FROM (
+            SELECT id, completed_at, created_at, 'hot' AS tier
+            FROM projects WHERE status = 'archived'
+            UNION ALL
+            SELECT id, completed_at, created_at, 'cold' AS tier
+            FROM projects_archive
+        ) AS archived
+    """
+    
+    def _iter_archived_projects(self, page: int = None, per_page: int = None,
+                                batch_size: int = 100):
+        """按归档顺序流式读取归档项目（生成器）
+        
+        先只对 (id, completed_at, created_at, tier) 排序分页，
+        再按id批量读取这一页的完整热数据行和冷数据BLOB，避免排序时带上所有冷数据的BLOB。
+        """
+        sql = f"{self._ARCHIVE_KEYS_SQL} ORDER BY {self._STATUS_ORDER_BY['archived']}"
+        params = None
+        if page is not None and per_page is not None:
+            sql += " LIMIT %s OFFSET %s"
+            params = (per_page, (page - 1) * per_page)
+        keys = [(row['tier'], row['id']) for row in self._execute_query(sql, params)]
+        
+        for start in range(0, len(keys), batch_size):
+            chunk = keys[start:start + batch_size]
+            hot_ids = [project_id for tier, project_id in chunk if tier == 'hot']
+            cold_ids = [project_id for tier, project_id in chunk if tier == 'cold']
+            hot_where, hot_params = self._id_filter(hot_ids)
+            cold_where, cold_params = self._id_filter(cold_ids)
+            rows_sql = self._archive_union_sql(hot_where, cold_where)
             
-            # 转换Decimal类型为float（用于JSON序列化）
-            for key, value in item.items():
-                if isinstance(value, Decimal):
-                    item[key] = float(value)
-            
-            # 转换日期格式为字符串
-            for key in ['created_at', 'updated_at', 'completed_at', 'start_date', 'end_date']:
-                if key in item and item[key]:
-                    if isinstance(item[key], datetime):
-                        if key in ['start_date', 'end_date']:
-                            item[key] = item[key].strftime('%Y-%m-%d')
-                        else:
-                            item[key] = item[key].strftime('%Y-%m-%d %H:%M:%S')
-                    elif hasattr(item[key], 'strftime'):
-                        # date对象
-                        if key in ['start_date', 'end_date']:
-                            item[key] = item[key].strftime('%Y-%m-%d')
+            items = {}
+            for item in self._iter_project_rows(rows_sql, hot_params + cold_params, batch_size=batch_size,
+                                                keep_tier=True):
+                items[(item.pop('tier'), item['id'])] = item
+            # 两次查询之间被删除或迁移的项目直接跳过
+            for key in chunk:
+                if key in items:
+                    yield items[key]
+    
+    @staticmethod
+    def _id_filter(project_ids: List[int]) -> tuple:
+        """生成 "AND id IN (...)" 条件及参数，列表为空时不匹配任何行"""
+        if not project_ids:
+            return "AND 1 = 0", ()
+        placeholders = ', '.join(['%s'] * len(project_ids))
+        return f"AND id IN ({placeholders})", tuple(project_ids)
+    
+    def _iter_project_rows(self, sql: str, params: tuple = None, batch_size: int = 100,
+                           keep_tier: bool = False):
+        """用服务端游标逐批读取项目行，转换格式并补齐进度记录（生成器）
+        
+        热数据的进度记录每批用一次IN查询加载，冷数据直接解压行内的BLOB。
+        keep_tier为True时在结果中保留tier字段。
+        生成器被提前关闭时会释放数据库连接。
+        """
+        conn = None
+        notes_conn = None
+        try:
+            conn = self._get_connection()
+            # 服务端游标未读完前不能在同一连接上执行其他查询，进度记录使用独立连接
+            notes_conn = self._get_connection()
+            with conn.cursor(pymysql.cursors.SSDictCursor) as cursor:
+                cursor.execute(sql, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    hot_ids = [row['id'] for row in rows if row.get('tier', 'hot') == 'hot']
+                    notes = self._load_progress_notes(notes_conn, hot_ids)
+                    for row in rows:
+                        row = dict(row)
+                        tier = row.pop('tier', 'hot')
+                        blob = row.pop('progress_notes_blob', None)
+                        item = self._format_project_row(row)
+                        if tier == 'cold':
+                            item['progress_notes'] = unpack_progress_notes(blob)
                         else:
-                            item[key] = item[key].strftime('%Y-%m-%d %H:%M:%S')
-                    elif isinstance(item[key], str):
-                        # 已经是字符串格式，确保格式正确
-                        if key in ['start_date', 'end_date'] and len(item[key]) > 10:
-                            try:
-                                dt = datetime.strptime(item[key], '%Y-%m-%d %H:%M:%S')
-                                item[key] = dt.strftime('%Y-%m-%d')
-                            except:
-                                pass
-            
-            result.append(item)
+                            item['progress_notes'] = notes.get(item['id'], [])
+                        if keep_tier:
+                            item['tier'] = tier
+                        yield item
+        except Exception as e:
+            logger.error(f"流式查询失败: {sql}, 参数: {params}, 错误: {e}")
+            raise
+        finally:
+            if notes_conn:
+                notes_conn.close()
+            if conn:
+                conn.close()
+    
+    def iter_projects(self, status: str, page: int = None, per_page: int = None,
+                      batch_size: int = 100):
+        """按状态流式读取项目（生成器）
+        
+        使用服务端游标逐批读取，避免把整页结果一次性读入内存。
+        archived状态会透明地合并冷数据表中的项目。
+        
+        Args:
+            status: 项目状态（concept/active/archived）
+            page: 页码（从1开始），如果为None则返回所有数据
+            per_page: 每页数量，如果为None则返回所有数据
+            batch_size: 每批从游标读取的行数
+        """
+        order_by = self._STATUS_ORDER_BY.get(status)
+        if order_by is None:
+            return iter(())
+        
+        if status == 'archived':
+            return self._iter_archived_projects(page, per_page, batch_size=batch_size)
+        
+        sql = f"SELECT * FROM projects WHERE status = %s ORDER BY {order_by}"
+        params = [status]
+        # 如果指定了分页参数，添加LIMIT和OFFSET
+        if page is not None and per_page is not None:
+            sql += " LIMIT %s OFFSET %s"
+            params += [per_page, (page - 1) * per_page]
+        
+        return self._iter_project_rows(sql, tuple(params), batch_size=batch_size)
+    
+    def get_project(self, project_id: int, status: str) -> Optional[Dict]:
+        """获取指定状态的单个项目（含进度记录），archived会同时查找冷数据表"""
+        if status == 'archived':
+            sql = self._archive_union_sql("AND id = %s")
+            params = (project_id, project_id)
+        else:
+            sql = "SELECT * FROM projects WHERE id = %s AND status = %s"
+            params = (project_id, status)
+        items = list(self._iter_project_rows(sql, params))
+        return items[0] if items else None
+    
+    def _load_json(self, table_name_or_path, page: int = None, per_page: int = None) -> List:
+        """从数据库表加载数据（兼容原有接口）
+        
+        Args:
+            table_name_or_path: 表名或路径
+            page: 页码（从1开始），如果为None则返回所有数据
+            per_page: 每页数量，如果为None则返回所有数据
+        
+        Returns:
+            如果指定了分页参数，返回字典 {'items': [...], 'total': 总数, 'page': 页码, 'per_page': 每页数量, 'pages': 总页数}
+            否则返回列表（兼容旧接口）
+        """
+        # 兼容原有接口：可能传入文件路径，需要转换为状态
+        status = self._resolve_status(table_name_or_path)
+        if status is None:
+            return [] if page is None else {'items': [], 'total': 0, 'page': 1, 'per_page': per_page or 10, 'pages': 0}
+        
+        # 先查询总数
+        total = self.count_projects(status)
+        result = list(self.iter_projects(status, page=page, per_page=per_page))
+        logger.info(f"从projects表查询到 {len(result)} 条状态为 '{status}' 的记录（总数: {total}）")
         
         # 如果指定了分页参数，返回分页结果
         if page is not None and per_page is not None:
@@ -291,13 +517,14 @@ class ProjectManagerMySQL:
                 UPDATE projects 
                 SET idea = %s, notes = %s, goal = %s, budget = %s, start_date = %s, end_date = %s, 
                     duration_days = %s, status = 'active', updated_at = %s
-                WHERE id = %s
+                WHERE id = %s AND status = 'concept'
             """
-            self._execute_query(
+            self._execute_status_change(
                 sql,
-                (idea_text, notes, goal, budget, start_date.date(), end_date.date(), 
+                (idea_text, notes, goal, budget, start_date.date(), end_date.date(),
                  duration_days, now, idea_id),
-                fetch=False
+                [self._activity_rollup_statement(start_date.date(), experiments_started=1)],
+                f"未找到ID为 {idea_id} 的概念想法"
             )
             exp_id = idea_id
             logger.info(f"成功将概念 {idea_id} 转换为实验")
@@ -308,12 +535,11 @@ class ProjectManagerMySQL:
                 (idea, goal, budget, start_date, end_date, duration_days, status, created_at, updated_at)
                 VALUES (%s, %s, %s, %s, %s, %s, 'active', %s, %s)
             """
-            exp_id = self._execute_query(
-                sql,
-                (idea_text, goal, budget, start_date.date(), end_date.date(), 
-                 duration_days, now, now),
-                fetch=False
-            )
+            exp_id = self._execute_transaction([
+                (sql, (idea_text, goal, budget, start_date.date(), end_date.date(),
+                       duration_days, now, now)),
+                self._activity_rollup_statement(start_date.date(), experiments_started=1)
+            ])[0]
             logger.info(f"成功创建新实验，ID: {exp_id}")
         
         return exp_id
@@ -330,9 +556,94 @@ class ProjectManagerMySQL:
             INSERT INTO progress_notes (project_id, note, created_at)
             VALUES (%s, %s, %s)
         """
-        self._execute_query(sql, (experiment_id, note, datetime.now()), fetch=False)
+        now = datetime.now()
+        self._execute_transaction([
+            (sql, (experiment_id, note, now)),
+            self._activity_rollup_statement(now.date(), notes_added=1)
+        ])
         logger.info(f"成功为实验 {experiment_id} 添加进度记录")
     
+    def is_active_experiment(self, experiment_id: int) -> bool:
+        """检查实验是否存在且状态为active"""
+        sql = "SELECT id FROM projects WHERE id = %s AND status = 'active'"
+        return bool(self._execute_query(sql, (experiment_id,)))
+    
+    def add_progress_notes_batch(self, rows: List[tuple]) -> int:
+        """批量写入进度记录（用于写缓冲刷新）
+        
+        Args:
+            rows: [(project_id, note, created_at), ...]
+        
+        Returns:
+            成功写入的条数。入队后实验已完成或被删除的记录会被跳过；
+            整批因数据错误失败时逐条重试，跳过无法写入的记录。
+            整批在同一个事务中提交，连接等其他错误直接抛出时没有任何记录被写入，
+            调用方可以原样重试整批。
+        """
+        if not rows:
+            return 0
+        total = len(rows)
+        
+        sql = """
+            INSERT INTO progress_notes (project_id, note, created_at)
+            VALUES (%s, %s, %s)
+        """
+        conn = None
+        try:
+            conn = self._get_connection()
+            with conn.cursor() as cursor:
+                # 入队时的校验可能已过期：写入前重新确认实验仍在进行中，
+                # 共享锁保证提交前实验不会被并发归档
+                project_ids = sorted({row[0] for row in rows})
+                id_placeholders = ', '.join(['%s'] * len(project_ids))
+                cursor.execute(
+                    f"""
+                        SELECT id FROM projects
+                        WHERE id IN ({id_placeholders}) AND status = 'active'
+                        LOCK IN SHARE MODE
+                    """,
+                    tuple(project_ids)
+                )
+                active_ids = {row['id'] for row in cursor.fetchall()}
+                skipped = [row for row in rows if row[0] not in active_ids]
+                if skipped:
+                    logger.warning(f"丢弃 {len(skipped)} 条进度记录，实验已不在进行中: "
+                                   f"{sorted({row[0] for row in skipped})}")
+                    rows = [row for row in rows if row[0] in active_ids]
+                # 整批只在最后提交一次：中途出现连接错误时没有任何记录被提交，
+                # 调用方重新入队整批记录不会造成重复写入
+                cursor.execute("SAVEPOINT progress_batch")
+                try:
+                    # PyMySQL会把executemany的INSERT合并为多行INSERT（过长时拆成多条）
+                    cursor.executemany(sql, rows)
+                    written = rows
+                except (pymysql.err.IntegrityError, pymysql.err.DataError) as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT progress_batch")
+                    logger.warning(f"批量写入进度记录失败，改为逐条写入: {e}")
+                    written = []
+                    for row in rows:
+                        cursor.execute("SAVEPOINT progress_row")
+                        try:
+                            cursor.execute(sql, row)
+                            written.append(row)
+                        except (pymysql.err.IntegrityError, pymysql.err.DataError) as row_error:
+                            cursor.execute("ROLLBACK TO SAVEPOINT progress_row")
+                            logger.error(f"丢弃无法写入的进度记录: 实验 {row[0]}, 错误: {row_error}")
+                self._bump_note_rollups(cursor, written)
+            conn.commit()
+            inserted = len(written)
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"批量写入进度记录失败: {e}")
+            raise
+        finally:
+            if conn:
+                conn.close()
+        
+        logger.info(f"批量写入 {inserted}/{total} 条进度记录")
+        return inserted
+    
     def complete_experiment(self, experiment_id: int, 
                            skill_learned: str = "",
                            experience: str = "",
@@ -355,12 +666,13 @@ class ProjectManagerMySQL:
             SET status = 'archived', completed_at = %s, 
                 skill_learned = %s, experience = %s, connection = %s,
                 updated_at = %s
-            WHERE id = %s
+            WHERE id = %s AND status = 'active'
         """
-        self._execute_query(
+        self._execute_status_change(
             sql,
             (completed_at, skill_learned, experience, connection, completed_at, experiment_id),
-            fetch=False
+            [self._activity_rollup_statement(completed_at.date(), experiments_completed=1)],
+            f"未找到ID为 {experiment_id} 的进行中实验"
         )
         
         # 进度记录不需要移动，因为它们已经通过project_id关联到projects表
@@ -375,6 +687,93 @@ class ProjectManagerMySQL:
         """列出所有已归档的项目"""
         return self._load_json('archived')
     
+    def delete_archived_project(self, archive_id: int):
+        """删除归档项目（热数据和冷数据表中都会删除，冷数据在projects表中的占位行保留以占住id）"""
+        self._execute_transaction([
+            self._tombstone_statement("FROM projects WHERE id = %s AND status = 'archived'", (archive_id,)),
+            self._tombstone_statement("FROM projects_archive WHERE id = %s", (archive_id,)),
+            ("DELETE FROM projects WHERE id = %s AND status = 'archived'", (archive_id,)),
+            ("DELETE FROM projects_archive WHERE id = %s", (archive_id,))
+        ])
+        logger.info(f"成功删除归档项目 ID: {archive_id}")
+    
+    def tier_archived_projects(self, older_than_days: int = 180, batch_size: int = 100) -> int:
+        """把完成时间早于 older_than_days 天的归档项目迁移到冷数据表
+        
+        每批在一个事务内完成：读取项目及其进度记录，把进度记录压缩为一个BLOB
+        写入projects_archive，删除热数据表中的进度记录，
+        并把projects表中的原行改为status='tiered'的占位行（冷数据表沿用原id，占位行防止id被重新分配）。
+        
+        Returns:
+            迁移的项目数量
+        """
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+        columns = ', '.join(PROJECT_COLUMNS)
+        placeholders = ', '.join(['%s'] * (len(PROJECT_COLUMNS) + 2))
+        insert_sql = f"""
+            INSERT INTO projects_archive ({columns}, progress_notes_blob, tiered_at)
+            VALUES ({placeholders})
+        """
+        
+        moved = 0
+        while True:
+            conn = None
+            try:
+                conn = self._get_connection()
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        """
+                            SELECT * FROM projects
+                            WHERE status = 'archived' AND completed_at < %s
+                            ORDER BY completed_at ASC
+                            LIMIT %s
+                            FOR UPDATE
+                        """,
+                        (cutoff, batch_size)
+                    )
+                    rows = cursor.fetchall()
+                    if not rows:
+                        conn.commit()
+                        break
+                    
+                    ids = [row['id'] for row in rows]
+                    notes = self._load_progress_notes(conn, ids)
+                    tiered_at = datetime.now()
+                    cursor.executemany(insert_sql, [
+                        tuple(row[column] for column in PROJECT_COLUMNS)
+                        + (pack_progress_notes(notes.get(row['id'], [])), tiered_at)
+                        for row in rows
+                    ])
+                    id_placeholders = ', '.join(['%s'] * len(ids))
+                    cursor.execute(f"DELETE FROM progress_notes WHERE project_id IN ({id_placeholders})", tuple(ids))
+                    # 原行改为不含文本的占位行而不是删除：MySQL 8.0之前，重启后AUTO_INCREMENT会重置为MAX(id)+1，
+                    # 占位行保证MAX(id)始终覆盖冷数据表中的id，新项目不会重新分配到这些id
+                    cursor.execute(
+                        f"""
+                            UPDATE projects
+                            SET status = 'tiered', idea = '', notes = NULL, goal = NULL,
+                                skill_learned = NULL, experience = NULL, connection = NULL
+                            WHERE id IN ({id_placeholders})
+                        """,
+                        tuple(ids)
+                    )
+                conn.commit()
+            except Exception as e:
+                if conn:
+                    conn.rollback()
+                logger.error(f"归档分层迁移失败: {e}")
+                raise
+            finally:
+                if conn:
+                    conn.close()
+            
+            moved += len(rows)
+            logger.info(f"已迁移 {moved} 个归档项目到冷数据表")
+            if len(rows) < batch_size:
+                break
+        
+        return moved
+    
     def get_statistics(self):
         """获取统计信息"""
         try:
@@ -399,6 +798,9 @@ class ProjectManagerMySQL:
                 elif row['status'] == 'archived':
                     archive_count = row['count']
             
+            # 加上已迁移到冷数据表的归档项目
+            archive_count += self.count_cold_archive()
+            
             return {
                 'incubator_count': incubator_count,
                 'active_count': active_count,
@@ -414,3 +816,218 @@ class ProjectManagerMySQL:
                 'archive_count': 0,
                 'total_explored': 0
             }
+    
+    # ========== 增量同步 ==========
+    
+    def get_changes(self, since: datetime, limit: int = 500) -> Optional[Dict]:
+        """返回 since 之后（含）新增/修改的项目、新增的进度记录和删除标记
+        
+        依赖 projects.updated_at、progress_notes.created_at 和 deleted_records.deleted_at 上的索引，
+        每类变化都是一次索引范围查询。任一类变化超过limit条时返回None，由调用方让客户端全量刷新。
+        
+        Returns:
+            {'projects': [...], 'notes': [...], 'deleted': [...]} 或 None
+        """
+        projects = self._execute_query(
+            """
+                SELECT * FROM projects
+                WHERE updated_at >= %s AND status <> 'tiered'
+                ORDER BY updated_at LIMIT %s
+            """,
+            (since, limit + 1)
+        )
+        notes = self._execute_query(
+            """
+                SELECT id, project_id, created_at, note FROM progress_notes
+                WHERE created_at >= %s ORDER BY created_at, id LIMIT %s
+            """,
+            (since, limit + 1)
+        )
+        deleted = self._execute_query(
+            """
+                SELECT entity, entity_id, deleted_at FROM deleted_records
+                WHERE deleted_at >= %s ORDER BY deleted_at LIMIT %s
+            """,
+            (since, limit + 1)
+        )
+        if len(projects) > limit or len(notes) > limit or len(deleted) > limit:
+            return None
+        
+        return {
+            'projects': [self._format_project_row(row) for row in projects],
+            'notes': [
+                {
+                    'id': row['id'],
+                    'project_id': row['project_id'],
+                    'date': row['created_at'].strftime('%Y-%m-%d %H:%M:%S') if isinstance(row['created_at'], datetime) else str(row['created_at']),
+                    'note': row['note']
+                }
+                for row in notes
+            ],
+            'deleted': [
+                {
+                    'entity': row['entity'],
+                    'id': row['entity_id'],
+                    'deleted_at': row['deleted_at'].strftime('%Y-%m-%d %H:%M:%S') if isinstance(row['deleted_at'], datetime) else str(row['deleted_at'])
+                }
+                for row in deleted
+            ]
+        }
+    
+    def purge_tombstones(self, older_than_days: int) -> int:
+        """清理早于 older_than_days 天的删除标记，返回清理的条数"""
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+        conn = None
+        try:
+            conn = self._get_connection()
+            with conn.cursor() as cursor:
+                purged = cursor.execute("DELETE FROM deleted_records WHERE deleted_at < %s", (cutoff,))
+            conn.commit()
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"清理删除标记失败: {e}")
+            raise
+        finally:
+            if conn:
+                conn.close()
+        logger.info(f"清理了 {purged} 条删除标记")
+        return purged
+    
+    # ========== 活动统计（每日汇总） ==========
+    
+    # 时间序列的聚合粒度 -> 周期起始日期的SQL表达式
+    _TIMELINE_PERIODS = {
+        'day': 'day',
+        'week': 'DATE_SUB(day, INTERVAL WEEKDAY(day) DAY)',
+        'month': 'DATE_SUB(day, INTERVAL DAYOFMONTH(day) - 1 DAY)',
+    }
+    
+    _ACTIVITY_METRICS = ('notes_added', 'experiments_started', 'experiments_completed')
+    
+    def _activity_rollup_statement(self, day, notes_added: int = 0,
+                                   experiments_started: int = 0,
+                                   experiments_completed: int = 0) -> tuple:
+        """生成累加某一天活动计数的SQL（与业务写入放在同一事务中执行）"""
+        sql = """
+            INSERT INTO activity_daily (day, notes_added, experiments_started, experiments_completed)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                notes_added = notes_added + VALUES(notes_added),
+                experiments_started = experiments_started + VALUES(experiments_started),
+                experiments_completed = experiments_completed + VALUES(experiments_completed)
+        """
+        return sql, (day, notes_added, experiments_started, experiments_completed)
+    
+    def _bump_note_rollups(self, cursor, rows: List[tuple]):
+        """按日期累加一批进度记录的数量，rows格式同 add_progress_notes_batch"""
+        per_day = {}
+        for _, _, created_at in rows:
+            day = created_at.date() if isinstance(created_at, datetime) else str(created_at)[:10]
+            per_day[day] = per_day.get(day, 0) + 1
+        for day, count in per_day.items():
+            cursor.execute(*self._activity_rollup_statement(day, notes_added=count))
+    
+    def backfill_activity_rollups(self) -> int:
+        """根据现有数据重建activity_daily（含冷数据表），返回生成的天数
+        
+        已删除项目的历史活动无法恢复，重建后以当前数据为准。
+        """
+        conn = None
+        try:
+            conn = self._get_connection()
+            with conn.cursor() as cursor:
+                cursor.execute("DELETE FROM activity_daily")
+                cursor.execute("""
+                    INSERT INTO activity_daily (day, notes_added)
+                    SELECT DATE(created_at) AS d, COUNT(*) FROM progress_notes GROUP BY d
+                    ON DUPLICATE KEY UPDATE notes_added = notes_added + VALUES(notes_added)
+                """)
+                # projects表中的占位行已计入冷数据表，不重复统计
+                for table, where in (('projects', "status <> 'tiered'"), ('projects_archive', '1 = 1')):
+                    cursor.execute(f"""
+                        INSERT INTO activity_daily (day, experiments_started)
+                        SELECT start_date AS d, COUNT(*) FROM {table}
+                        WHERE {where} AND start_date IS NOT NULL GROUP BY d
+                        ON DUPLICATE KEY UPDATE experiments_started = experiments_started + VALUES(experiments_started)
+                    """)
+                    cursor.execute(f"""
+                        INSERT INTO activity_daily (day, experiments_completed)
+                        SELECT DATE(completed_at) AS d, COUNT(*) FROM {table}
+                        WHERE {where} AND completed_at IS NOT NULL GROUP BY d
+                        ON DUPLICATE KEY UPDATE experiments_completed = experiments_completed + VALUES(experiments_completed)
+                    """)
+                
+                # 冷数据表的进度记录压缩在BLOB中，需要解压后按日期统计
+                cursor.execute("SELECT progress_notes_blob FROM projects_archive")
+                per_day = {}
+                for row in cursor.fetchall():
+                    for note in unpack_progress_notes(row['progress_notes_blob']):
+                        day = note['date'][:10]
+                        per_day[day] = per_day.get(day, 0) + 1
+                for day, count in per_day.items():
+                    cursor.execute(*self._activity_rollup_statement(day, notes_added=count))
+                
+                cursor.execute("SELECT COUNT(*) as total FROM activity_daily")
+                days = cursor.fetchone()['total']
+            conn.commit()
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"重建活动统计失败: {e}")
+            raise
+        finally:
+            if conn:
+                conn.close()
+        
+        logger.info(f"活动统计重建完成，共 {days} 天")
+        return days
+    
+    def align_timeline_range(self, granularity: str, start, end) -> tuple:
+        """把 [start, end] 扩展到完整的周期：start提前到所在周期的第一天，end延后到所在周期的最后一天
+        
+        否则首尾不完整的周、月只统计了范围内的几天，却按整个周期标注。
+        
+        Returns:
+            (start, end)
+        """
+        if granularity not in self._TIMELINE_PERIODS:
+            raise ValueError(f"不支持的统计粒度: {granularity}")
+        if granularity == 'week':
+            start = start - timedelta(days=start.weekday())
+            end = end + timedelta(days=6 - end.weekday())
+        elif granularity == 'month':
+            start = start.replace(day=1)
+            end = end.replace(day=calendar.monthrange(end.year, end.month)[1])
+        return start, end
+    
+    def get_activity_timeline(self, granularity: str, start, end) -> List[Dict]:
+        """按天/周/月返回活动时间序列（没有活动的周期不返回）
+        
+        范围会先用 align_timeline_range 扩展到完整的周期。
+        
+        Args:
+            granularity: day、week 或 month，周从周一开始
+            start: 起始日期（date）
+            end: 结束日期（date，包含）
+        """
+        start, end = self.align_timeline_range(granularity, start, end)
+        period = self._TIMELINE_PERIODS[granularity]
+        
+        sums = ', '.join(f"SUM({metric}) AS {metric}" for metric in self._ACTIVITY_METRICS)
+        sql = f"""
+            SELECT {period} AS period_start, {sums}
+            FROM activity_daily
+            WHERE day BETWEEN %s AND %s
+            GROUP BY period_start
+            ORDER BY period_start
+        """
+        rows = self._execute_query(sql, (start, end))
+        series = []
+        for row in rows:
+            period_start = row['period_start']
+            point = {'period': period_start.strftime('%Y-%m-%d') if hasattr(period_start, 'strftime') else str(period_start)}
+            for metric in self._ACTIVITY_METRICS:
+                point[metric] = int(row[metric] or 0)
+            series.append(point)
+        return series
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+三分钟热情项目管理系统 - 按需请求性能分析
+
+设置 PROFILING_ENABLED=1 后，带有 X-Profile-Token 请求头（值为 PROFILING_TOKEN）的请求，
+或按 PROFILING_SAMPLE_RATE 比例抽样的请求，会在cProfile下运行。
+分析结果（耗时最多的函数、累计时间、SQL执行次数）保存在有界的内存环形缓冲中，
+通过受同一令牌保护的 /api/debug/profiles 查看。未开启时没有任何额外开销。
+"""
+
+import cProfile
+import hmac
+import itertools
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile-Token'
+
+# PyMySQL中执行SQL的函数，用它的调用次数统计SQL数量（DictCursor、SSDictCursor都继承自Cursor.execute）
+_SQL_EXECUTE = (os.path.join('pymysql', 'cursors.py'), 'execute')
+
+
+class ProfileSession:
+    """一次正在进行的请求分析"""
+
+    def __init__(self, trigger: str):
+        self.trigger = trigger
+        self.started_at = datetime.now()
+        self.profiler = cProfile.Profile()
+        self._start = time.perf_counter()
+        self.profiler.enable()
+
+    def stop(self) -> float:
+        """停止分析，返回请求耗时（秒）"""
+        self.profiler.disable()
+        return time.perf_counter() - self._start
+
+
+class RequestProfiler:
+    """请求性能分析器：决定哪些请求需要分析，并保存最近的分析结果"""
+
+    def __init__(self, token: Optional[str] = None, sample_rate: float = 0.0,
+                 ring_size: int = 50, top_n: int = 25):
+        self.token = token
+        self.sample_rate = sample_rate
+        self.top_n = top_n
+        self._profiles = deque(maxlen=ring_size)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    @classmethod
+    def from_env(cls) -> Optional['RequestProfiler']:
+        """根据环境变量创建分析器，未开启时返回None"""
+        if os.environ.get('PROFILING_ENABLED', '').strip().lower() not in ('1', 'true', 'yes', 'on'):
+            return None
+        profiler = cls(
+            token=os.environ.get('PROFILING_TOKEN') or None,
+            sample_rate=float(os.environ.get('PROFILING_SAMPLE_RATE', '0')),
+            ring_size=int(os.environ.get('PROFILING_RING_SIZE', '50')),
+            top_n=int(os.environ.get('PROFILING_TOP_N', '25'))
+        )
+        if not profiler.token and profiler.sample_rate <= 0:
+            logger.warning("已开启性能分析，但未设置PROFILING_TOKEN或PROFILING_SAMPLE_RATE，不会分析任何请求")
+        return profiler
+
+    def check_token(self, value: Optional[str]) -> bool:
+        """校验请求中的令牌（未配置令牌时始终失败）"""
+        # 按字节比较：compare_digest不支持含非ASCII字符的str（请求头按latin-1解码，可能含任意字符）
+        return bool(self.token and value and
+                    hmac.compare_digest(value.encode('utf-8'), self.token.encode('utf-8')))
+
+    def start(self, header_value: Optional[str]) -> Optional[ProfileSession]:
+        """如果该请求需要分析则开始分析，否则返回None"""
+        if header_value is not None and self.check_token(header_value):
+            trigger = 'header'
+        elif self.sample_rate > 0 and random.random() < self.sample_rate:
+            trigger = 'sample'
+        else:
+            return None
+        try:
+            return ProfileSession(trigger)
+        except ValueError as e:
+            # 同一时间只能有一个分析器处于开启状态（Python 3.12+），此时跳过本次请求
+            logger.warning(f"无法开启性能分析: {e}")
+            return None
+
+    def finish(self, session: ProfileSession, method: str, path: str, status: Optional[int]):
+        """结束分析，汇总结果并放入环形缓冲"""
+        wall_seconds = session.stop()
+        stats = pstats.Stats(session.profiler)
+
+        sql_count = 0
+        entries = []
+        for (filename, lineno, funcname), (cc, nc, tt, ct, callers) in stats.stats.items():
+            if funcname == _SQL_EXECUTE[1] and filename.endswith(_SQL_EXECUTE[0]):
+                sql_count += nc
+            entries.append({
+                'function': funcname,
+                'location': f"{_short_path(filename)}:{lineno}",
+                'calls': nc,
+                'primitive_calls': cc,
+                'tottime_ms': round(tt * 1000, 3),
+                'cumtime_ms': round(ct * 1000, 3)
+            })
+        entries.sort(key=lambda entry: entry['cumtime_ms'], reverse=True)
+
+        record = {
+            'id': next(self._ids),
+            'method': method,
+            'path': path,
+            'status': status,
+            'trigger': session.trigger,
+            'started_at': session.started_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'wall_ms': round(wall_seconds * 1000, 3),
+            'total_calls': stats.total_calls,
+            'sql_count': sql_count,
+            'top': entries[:self.top_n]
+        }
+        with self._lock:
+            self._profiles.append(record)
+        logger.info(f"已分析请求 {method} {path}: {record['wall_ms']}ms, {sql_count} 条SQL")
+
+    def profiles(self) -> List[Dict]:
+        """返回保存的分析结果（最新的在前）"""
+        with self._lock:
+            return list(reversed(self._profiles))
+
+
+def _short_path(filename: str) -> str:
+    """把绝对路径缩短为相对当前目录或site-packages的路径，便于阅读"""
+    for marker in ('site-packages' + os.sep, 'dist-packages' + os.sep):
+        index = filename.rfind(marker)
+        if index != -1:
+            return filename[index + len(marker):]
+    cwd = os.getcwd() + os.sep
+    if filename.startswith(cwd):
+        return filename[len(cwd):]
+    return filename
@@ -7,19 +7,70 @@ let paginationState = {
     archive: { page: 1, per_page: 10 }
 };
 
+// 增量同步令牌（/api/changes），null表示需要先全量加载
+let syncToken = null;
+// 上次全量刷新的时间
+let lastFullRefresh = 0;
+// 即使没有变化也定期全量刷新（剩余天数等随时间变化的字段）
+const FULL_REFRESH_INTERVAL = 10 * 60 * 1000;
+
 // 页面加载时初始化
 document.addEventListener('DOMContentLoaded', function() {
+    refreshAll();
+    
+    // 定期增量同步
+    setInterval(syncChanges, 30000); // 每30秒同步一次
+});
+
+// 全量加载所有列表，并记录同步令牌
+async function refreshAll(token = null) {
+    // 先取令牌再加载，加载期间发生的变化会在下一次同步中拿到
+    if (!token) {
+        try {
+            const response = await fetch('/api/changes');
+            const data = await response.json();
+            token = data.token || null;
+        } catch (error) {
+            console.error('获取同步令牌失败:', error);
+        }
+    }
+    syncToken = token;
+    lastFullRefresh = Date.now();
+    
     loadStats();
     loadIncubator();
     loadExperiments();
     loadArchive();
+}
+
+// 增量同步：只获取上次同步以来的变化并合并到已加载的列表中
+async function syncChanges() {
+    if (!syncToken || Date.now() - lastFullRefresh > FULL_REFRESH_INTERVAL) {
+        await refreshAll();
+        return;
+    }
     
-    // 定期刷新数据
-    setInterval(() => {
-        loadStats();
-        loadExperiments();
-    }, 30000); // 每30秒刷新一次
-});
+    try {
+        const response = await fetch(`/api/changes?since=${encodeURIComponent(syncToken)}`);
+        const data = await response.json();
+        
+        if (data.error) {
+            console.error('增量同步失败:', data.error);
+            return;
+        }
+        if (data.reset) {
+            await refreshAll(data.token);
+            return;
+        }
+        
+        syncToken = data.token;
+        if (applyChanges(data)) {
+            loadStats();
+        }
+    } catch (error) {
+        console.error('增量同步失败:', error);
+    }
+}
 
 // 显示主页面
 function showMainPage() {
@@ -83,6 +134,212 @@ async function loadStats() {
     }
 }
 
+// ========== 列表渲染（按ID增量更新） ==========
+
+// 各列表的客户端存储：按ID缓存已渲染的节点，刷新时只替换内容变化的卡片
+const listStores = {
+    incubator: createListStore('incubator-list', renderIdeaCard,
+        renderEmptyState('💡', '兴趣孵化池是空的，快添加一些想法吧！')),
+    experiments: createListStore('experiments-list', renderExperimentCard,
+        renderEmptyState('🚀', '当前没有进行中的实验')),
+    archive: createListStore('archive-list', renderArchiveCard,
+        renderEmptyState('📦', '项目档案馆是空的'))
+};
+
+// 创建列表存储
+function createListStore(containerId, renderItem, emptyHtml) {
+    return {
+        containerId,
+        renderItem,
+        emptyHtml,
+        items: [],
+        nodes: new Map()    // id -> { sig, el }
+    };
+}
+
+// 空状态HTML
+function renderEmptyState(icon, text) {
+    return `
+        <div class="empty-state">
+            <div class="empty-state-icon">${icon}</div>
+            <div class="empty-state-text">${text}</div>
+        </div>
+    `;
+}
+
+// 把HTML字符串转换为单个元素
+function htmlToElement(html) {
+    const template = document.createElement('template');
+    template.innerHTML = html.trim();
+    return template.content.firstElementChild;
+}
+
+// 获取某条数据对应的节点，内容没变时复用已有节点
+function getItemNode(store, item) {
+    const sig = JSON.stringify(item);
+    const entry = store.nodes.get(item.id);
+    if (entry && entry.sig === sig) {
+        return entry.el;
+    }
+    const el = htmlToElement(store.renderItem(item));
+    el.dataset.id = item.id;
+    store.nodes.set(item.id, { sig, el });
+    return el;
+}
+
+// 让parent的子节点与desired一致，只移动、插入或删除有差异的节点
+function patchChildren(parent, desired) {
+    let current = parent.firstChild;
+    desired.forEach(node => {
+        if (node === current) {
+            current = current.nextSibling;
+        } else {
+            parent.insertBefore(node, current);
+        }
+    });
+    while (current) {
+        const next = current.nextSibling;
+        parent.removeChild(current);
+        current = next;
+    }
+}
+
+// 在列表位置显示一段提示HTML（空状态、错误信息），并清空节点缓存
+function showListMessage(store, html) {
+    const container = document.getElementById(store.containerId);
+    store.items = [];
+    store.nodes.clear();
+    container.innerHTML = html;
+}
+
+// 用新数据更新列表，返回内容是否有变化
+function renderList(store, items) {
+    const container = document.getElementById(store.containerId);
+    if (!container) {
+        return false;
+    }
+    
+    const changed = items.length !== store.items.length ||
+        items.some((item, index) => {
+            const entry = store.nodes.get(item.id);
+            return store.items[index].id !== item.id || !entry || entry.sig !== JSON.stringify(item);
+        });
+    store.items = items;
+    
+    // 丢弃已不在列表中的节点
+    const ids = new Set(items.map(item => item.id));
+    for (const id of store.nodes.keys()) {
+        if (!ids.has(id)) {
+            store.nodes.delete(id);
+        }
+    }
+    
+    if (items.length === 0) {
+        showListMessage(store, store.emptyHtml);
+        return changed;
+    }
+    
+    patchChildren(container, items.map(item => getItemNode(store, item)));
+    return changed;
+}
+
+// 从接口返回值中取出列表和分页信息（兼容旧接口）
+function parseListResponse(data) {
+    if (data.items && data.total !== undefined) {
+        return { items: data.items, pagination: data };
+    } else if (Array.isArray(data)) {
+        return { items: data, pagination: null };
+    }
+    console.warn('API返回的数据格式不正确:', data);
+    return { items: [], pagination: null };
+}
+
+// 渲染想法卡片
+function renderIdeaCard(idea) {
+    return `
+        <div class="idea-card">
+            <h3>${escapeHtml(idea.idea)}</h3>
+            <div class="meta">创建时间: ${idea.created_at}</div>
+            ${idea.notes ? `<div class="notes">${escapeHtml(idea.notes)}</div>` : ''}
+            <div class="actions">
+                <button class="btn btn-primary btn-small" onclick="startExperimentFromIdea(${idea.id})">启动实验</button>
+                <button class="btn btn-danger btn-small" onclick="removeIdea(${idea.id})">删除</button>
+            </div>
+        </div>
+    `;
+}
+
+// 渲染实验卡片
+function renderExperimentCard(exp) {
+    const daysLeft = exp.days_left || 0;
+    const daysClass = daysLeft > 0 ? 'positive' : 'negative';
+    const daysText = daysLeft > 0 ? `剩余 ${daysLeft} 天` : `已过期 ${Math.abs(daysLeft)} 天`;
+    
+    return `
+        <div class="experiment-card">
+            <h3>${escapeHtml(exp.idea)}</h3>
+            ${exp.notes ? `<div class="notes">${escapeHtml(exp.notes)}</div>` : ''}
+            <div class="goal">目标: ${escapeHtml(exp.goal)}</div>
+            <div class="meta">
+                <div class="meta-item">
+                    <span class="meta-item-label">开始日期</span>
+                    <span class="meta-item-value">${exp.start_date}</span>
+                </div>
+                <div class="meta-item">
+                    <span class="meta-item-label">结束日期</span>
+                    <span class="meta-item-value">${exp.end_date}</span>
+                </div>
+                <div class="meta-item">
+                    <span class="meta-item-label">状态</span>
+                    <span class="days-left ${daysClass}">${daysText}</span>
+                </div>
+            </div>
+            <div class="actions">
+                <button class="btn btn-primary btn-small" onclick="showExperimentDetail(${exp.id})">查看详情</button>
+                <button class="btn btn-success btn-small" onclick="showCompleteModal(${exp.id})">完成实验</button>
+            </div>
+        </div>
+    `;
+}
+
+// 渲染归档卡片
+function renderArchiveCard(entry) {
+    return `
+        <div class="archive-card">
+            <h3>${escapeHtml(entry.idea)}</h3>
+            <div class="time-range">${entry.start_date} → ${entry.end_date} | 完成于: ${entry.completed_at}</div>
+            ${entry.notes ? `<div class="notes">${escapeHtml(entry.notes)}</div>` : ''}
+            <div class="goal">目标: ${escapeHtml(entry.goal)}</div>
+            ${entry.skill_learned || entry.experience || entry.connection ? `
+                <div class="review">
+                    ${entry.skill_learned ? `
+                        <div class="review-item">
+                            <div class="review-item-label">💡 技能收获</div>
+                            <div class="review-item-content">${escapeHtml(entry.skill_learned)}</div>
+                        </div>
+                    ` : ''}
+                    ${entry.experience ? `
+                        <div class="review-item">
+                            <div class="review-item-label">😊 过程体验</div>
+                            <div class="review-item-content">${escapeHtml(entry.experience)}</div>
+                        </div>
+                    ` : ''}
+                    ${entry.connection ? `
+                        <div class="review-item">
+                            <div class="review-item-label">🔗 连接可能性</div>
+                            <div class="review-item-content">${escapeHtml(entry.connection)}</div>
+                        </div>
+                    ` : ''}
+                </div>
+            ` : ''}
+            <div class="actions" style="margin-top: 15px;">
+                <button class="btn btn-primary btn-small" onclick="showArchiveDetail(${entry.id})">查看详情</button>
+                <button class="btn btn-danger btn-small" onclick="deleteArchiveItem(${entry.id}, '${escapeHtml(entry.idea)}')">删除</button>
+            </div>
+        </div>
+    `;
+}
+
 // 加载兴趣孵化池
 async function loadIncubator(page = null) {
     try {
@@ -91,44 +348,18 @@ async function loadIncubator(page = null) {
         const response = await fetch(`/api/incubator?page=${currentPage}&per_page=${perPage}`);
         const data = await response.json();
         
-        // 判断是分页结果还是列表结果（兼容旧接口）
-        let ideas, pagination;
-        if (data.items && data.total !== undefined) {
-            ideas = data.items;
-            pagination = data;
+        const { items: ideas, pagination } = parseListResponse(data);
+        if (pagination) {
             paginationState.incubator.page = currentPage;
-        } else {
-            ideas = data;
-            pagination = null;
         }
         
-        const container = document.getElementById('incubator-list');
-        
-        if (ideas.length === 0) {
-            container.innerHTML = `
-                <div class="empty-state">
-                    <div class="empty-state-icon">💡</div>
-                    <div class="empty-state-text">兴趣孵化池是空的，快添加一些想法吧！</div>
-                </div>
-            `;
-            document.getElementById('incubator-pagination').innerHTML = '';
-            return;
+        // 孵化池内容有变化时，下拉框使用的想法列表也需要重新获取
+        if (renderList(listStores.incubator, ideas)) {
+            invalidateIdeaCache();
         }
         
-        container.innerHTML = ideas.map(idea => `
-            <div class="idea-card">
-                <h3>${escapeHtml(idea.idea)}</h3>
-                <div class="meta">创建时间: ${idea.created_at}</div>
-                ${idea.notes ? `<div class="notes">${escapeHtml(idea.notes)}</div>` : ''}
-                <div class="actions">
-                    <button class="btn btn-primary btn-small" onclick="startExperimentFromIdea(${idea.id})">启动实验</button>
-                    <button class="btn btn-danger btn-small" onclick="removeIdea(${idea.id})">删除</button>
-                </div>
-            </div>
-        `).join('');
-        
         // 渲染分页控件
-        if (pagination) {
+        if (pagination && ideas.length > 0) {
             renderPagination('incubator-pagination', pagination, function(newPage) {
                 loadIncubator(newPage);
             });
@@ -157,83 +388,20 @@ async function loadExperiments(page = null) {
         // 检查是否有错误
         if (data.error) {
             console.error('加载实验失败:', data.error);
-            document.getElementById('experiments-list').innerHTML = `
-                <div class="empty-state">
-                    <div class="empty-state-icon">⚠️</div>
-                    <div class="empty-state-text">加载失败: ${escapeHtml(data.error)}</div>
-                </div>
-            `;
+            showListMessage(listStores.experiments, renderEmptyState('⚠️', `加载失败: ${escapeHtml(data.error)}`));
             document.getElementById('experiments-pagination').innerHTML = '';
             return;
         }
         
-        // 判断是分页结果还是列表结果（兼容旧接口）
-        let experiments, pagination;
-        if (data.items && data.total !== undefined) {
-            experiments = data.items;
-            pagination = data;
+        const { items: experiments, pagination } = parseListResponse(data);
+        if (pagination) {
             paginationState.experiments.page = currentPage;
-        } else if (Array.isArray(data)) {
-            experiments = data;
-            pagination = null;
-        } else {
-            console.warn('API返回的数据格式不正确:', data);
-            experiments = [];
-            pagination = null;
         }
         
-        const container = document.getElementById('experiments-list');
-        
-        if (!container) {
-            console.error('找不到experiments-list容器');
-            return;
-        }
-        
-        if (experiments.length === 0) {
-            container.innerHTML = `
-                <div class="empty-state">
-                    <div class="empty-state-icon">🚀</div>
-                    <div class="empty-state-text">当前没有进行中的实验</div>
-                </div>
-            `;
-            document.getElementById('experiments-pagination').innerHTML = '';
-            return;
-        }
-        
-        container.innerHTML = experiments.map(exp => {
-            const daysLeft = exp.days_left || 0;
-            const daysClass = daysLeft > 0 ? 'positive' : 'negative';
-            const daysText = daysLeft > 0 ? `剩余 ${daysLeft} 天` : `已过期 ${Math.abs(daysLeft)} 天`;
-            
-            return `
-                <div class="experiment-card">
-                    <h3>${escapeHtml(exp.idea)}</h3>
-                    ${exp.notes ? `<div class="notes">${escapeHtml(exp.notes)}</div>` : ''}
-                    <div class="goal">目标: ${escapeHtml(exp.goal)}</div>
-                    <div class="meta">
-                        <div class="meta-item">
-                            <span class="meta-item-label">开始日期</span>
-                            <span class="meta-item-value">${exp.start_date}</span>
-                        </div>
-                        <div class="meta-item">
-                            <span class="meta-item-label">结束日期</span>
-                            <span class="meta-item-value">${exp.end_date}</span>
-                        </div>
-                        <div class="meta-item">
-                            <span class="meta-item-label">状态</span>
-                            <span class="days-left ${daysClass}">${daysText}</span>
-                        </div>
-                    </div>
-                    <div class="actions">
-                        <button class="btn btn-primary btn-small" onclick="showExperimentDetail(${exp.id})">查看详情</button>
-                        <button class="btn btn-success btn-small" onclick="showCompleteModal(${exp.id})">完成实验</button>
-                    </div>
-                </div>
-            `;
-        }).join('');
+        renderList(listStores.experiments, experiments);
         
         // 渲染分页控件
-        if (pagination) {
+        if (pagination && experiments.length > 0) {
             renderPagination('experiments-pagination', pagination, function(newPage) {
                 loadExperiments(newPage);
             });
@@ -242,14 +410,8 @@ async function loadExperiments(page = null) {
         }
     } catch (error) {
         console.error('加载实验失败:', error);
-        const container = document.getElementById('experiments-list');
-        if (container) {
-            container.innerHTML = `
-                <div class="empty-state">
-                    <div class="empty-state-icon">⚠️</div>
-                    <div class="empty-state-text">加载失败: ${escapeHtml(error.message)}</div>
-                </div>
-            `;
+        if (document.getElementById('experiments-list')) {
+            showListMessage(listStores.experiments, renderEmptyState('⚠️', `加载失败: ${escapeHtml(error.message)}`));
         }
         document.getElementById('experiments-pagination').innerHTML = '';
     }
@@ -263,67 +425,15 @@ async function loadArchive(page = null) {
         const response = await fetch(`/api/archive?page=${currentPage}&per_page=${perPage}`);
         const data = await response.json();
         
-        // 判断是分页结果还是列表结果（兼容旧接口）
-        let archive, pagination;
-        if (data.items && data.total !== undefined) {
-            archive = data.items;
-            pagination = data;
+        const { items: archive, pagination } = parseListResponse(data);
+        if (pagination) {
             paginationState.archive.page = currentPage;
-        } else {
-            archive = data;
-            pagination = null;
-        }
-        
-        const container = document.getElementById('archive-list');
-        
-        if (archive.length === 0) {
-            container.innerHTML = `
-                <div class="empty-state">
-                    <div class="empty-state-icon">📦</div>
-                    <div class="empty-state-text">项目档案馆是空的</div>
-                </div>
-            `;
-            document.getElementById('archive-pagination').innerHTML = '';
-            return;
         }
         
-        container.innerHTML = archive.map(entry => `
-            <div class="archive-card">
-                <h3>${escapeHtml(entry.idea)}</h3>
-                <div class="time-range">${entry.start_date} → ${entry.end_date} | 完成于: ${entry.completed_at}</div>
-                ${entry.notes ? `<div class="notes">${escapeHtml(entry.notes)}</div>` : ''}
-                <div class="goal">目标: ${escapeHtml(entry.goal)}</div>
-                ${entry.skill_learned || entry.experience || entry.connection ? `
-                    <div class="review">
-                        ${entry.skill_learned ? `
-                            <div class="review-item">
-                                <div class="review-item-label">💡 技能收获</div>
-                                <div class="review-item-content">${escapeHtml(entry.skill_learned)}</div>
-                            </div>
-                        ` : ''}
-                        ${entry.experience ? `
-                            <div class="review-item">
-                                <div class="review-item-label">😊 过程体验</div>
-                                <div class="review-item-content">${escapeHtml(entry.experience)}</div>
-                            </div>
-                        ` : ''}
-                        ${entry.connection ? `
-                            <div class="review-item">
-                                <div class="review-item-label">🔗 连接可能性</div>
-                                <div class="review-item-content">${escapeHtml(entry.connection)}</div>
-                            </div>
-                        ` : ''}
-                    </div>
-                ` : ''}
-                <div class="actions" style="margin-top: 15px;">
-                    <button class="btn btn-primary btn-small" onclick="showArchiveDetail(${entry.id})">查看详情</button>
-                    <button class="btn btn-danger btn-small" onclick="deleteArchiveItem(${entry.id}, '${escapeHtml(entry.idea)}')">删除</button>
-                </div>
-            </div>
-        `).join('');
+        renderList(listStores.archive, archive);
         
         // 渲染分页控件
-        if (pagination) {
+        if (pagination && archive.length > 0) {
             renderPagination('archive-pagination', pagination, function(newPage) {
                 loadArchive(newPage);
             });
@@ -335,6 +445,97 @@ async function loadArchive(page = null) {
     }
 }
 
+// ========== 增量同步合并 ==========
+
+// 项目状态对应的列表
+const STATUS_LISTS = {
+    concept: 'incubator',
+    active: 'experiments',
+    archived: 'archive'
+};
+
+// 各列表的加载函数
+const LIST_LOADERS = {
+    incubator: loadIncubator,
+    experiments: loadExperiments,
+    archive: loadArchive
+};
+
+// 把新的进度记录合并到项目中（按时间和内容去重，同步区间有重叠）
+function mergeProgressNotes(item, notes) {
+    const existing = item.progress_notes || [];
+    const seen = new Set(existing.map(note => `${note.date}\n${note.note}`));
+    const added = notes
+        .filter(note => !seen.has(`${note.date}\n${note.note}`))
+        .map(note => ({ date: note.date, note: note.note }));
+    return added.length ? Object.assign({}, item, { progress_notes: existing.concat(added) }) : item;
+}
+
+// 合并增量变化，返回是否有变化
+// 字段更新和新进度记录直接在本地合并；新增、删除或状态变化会改变分页，只重新加载受影响的列表
+function applyChanges(changes) {
+    const projects = changes.projects || [];
+    const notes = changes.notes || [];
+    const deleted = changes.deleted || [];
+    if (projects.length === 0 && notes.length === 0 && deleted.length === 0) {
+        return false;
+    }
+    
+    const deletedIds = new Set(deleted.filter(record => record.entity === 'project').map(record => record.id));
+    const updates = new Map(projects.map(project => [project.id, project]));
+    const notesByProject = new Map();
+    notes.forEach(note => {
+        if (!notesByProject.has(note.project_id)) {
+            notesByProject.set(note.project_id, []);
+        }
+        notesByProject.get(note.project_id).push(note);
+    });
+    
+    // 新出现在某个列表中的项目
+    const reload = new Set();
+    projects.forEach(project => {
+        const target = STATUS_LISTS[project.status];
+        if (target && !listStores[target].items.some(item => item.id === project.id)) {
+            reload.add(target);
+        }
+    });
+    
+    Object.keys(listStores).forEach(name => {
+        if (reload.has(name)) {
+            return;
+        }
+        const store = listStores[name];
+        const items = [];
+        let structural = false;
+        store.items.forEach(item => {
+            const update = updates.get(item.id);
+            if (deletedIds.has(item.id) || (update && STATUS_LISTS[update.status] !== name)) {
+                structural = true;
+                return;
+            }
+            let merged = update ? Object.assign({}, item, update) : item;
+            if (notesByProject.has(item.id)) {
+                merged = mergeProgressNotes(merged, notesByProject.get(item.id));
+            }
+            items.push(merged);
+        });
+        
+        if (structural) {
+            reload.add(name);
+        } else if (renderList(store, items) && name === 'incubator') {
+            invalidateIdeaCache();
+        }
+    });
+    reload.forEach(name => LIST_LOADERS[name]());
+    
+    // 正在查看的实验有新的进度记录时刷新详情
+    if (currentExperimentId && notesByProject.has(currentExperimentId) &&
+        document.getElementById('detail-page').style.display !== 'none') {
+        showExperimentDetail(currentExperimentId);
+    }
+    return true;
+}
+
 // 显示添加想法模态框
 function showAddIdeaModal() {
     document.getElementById('add-idea-modal').classList.add('active');
@@ -367,6 +568,7 @@ async function addIdea(event) {
         
         if (result.success) {
             closeModal('add-idea-modal');
+            invalidateIdeaCache();
             loadIncubator();
             loadStats();
         } else {
@@ -391,6 +593,7 @@ async function removeIdea(ideaId) {
         const result = await response.json();
         
         if (result.success) {
+            invalidateIdeaCache();
             loadIncubator();
             loadStats();
         }
@@ -419,30 +622,53 @@ async function showStartExperimentModal() {
     document.getElementById('idea-select').value = '';
 }
 
+// 孵化池全部想法的缓存，启动实验的下拉框和选择回填共用，只在内容变化后重新获取
+let ideaCache = null;   // Promise<{ items, byId }>
+
+// 获取孵化池全部想法（不分页）
+function getAllIdeas() {
+    if (!ideaCache) {
+        ideaCache = fetch('/api/incubator?per_page=1000')
+            .then(res => res.json())
+            .then(data => {
+                const ideas = parseListResponse(data).items;
+                return { items: ideas, byId: new Map(ideas.map(idea => [String(idea.id), idea])) };
+            })
+            .catch(error => {
+                ideaCache = null;
+                throw error;
+            });
+    }
+    return ideaCache;
+}
+
+// 孵化池有增删或启动实验后，下次使用时重新获取想法列表
+function invalidateIdeaCache() {
+    ideaCache = null;
+}
+
 // 加载想法到选择框
 async function loadIdeasToSelect() {
     try {
-        // 获取所有想法（不分页），用于下拉选择
-        const response = await fetch('/api/incubator?per_page=1000');
-        const data = await response.json();
+        const { items: ideas } = await getAllIdeas();
+        const select = document.getElementById('idea-select');
         
-        // 判断是分页结果还是列表结果（兼容旧接口）
-        let ideas;
-        if (data.items && data.total !== undefined) {
-            ideas = data.items;
-        } else {
-            ideas = data;
+        // 想法列表没变时保留现有选项
+        const sig = JSON.stringify(ideas.map(idea => [idea.id, idea.idea]));
+        if (select.dataset.sig === sig) {
+            return;
         }
+        select.dataset.sig = sig;
         
-        const select = document.getElementById('idea-select');
-        select.innerHTML = '<option value="">-- 或直接输入新想法 --</option>';
-        
+        const fragment = document.createDocumentFragment();
         ideas.forEach(idea => {
             const option = document.createElement('option');
             option.value = idea.id;
             option.textContent = idea.idea;
-            select.appendChild(option);
+            fragment.appendChild(option);
         });
+        select.innerHTML = '<option value="">-- 或直接输入新想法 --</option>';
+        select.appendChild(fragment);
     } catch (error) {
         console.error('加载想法列表失败:', error);
     }
@@ -454,23 +680,13 @@ function onIdeaSelectChange() {
     const ideaInput = document.getElementById('experiment-idea');
     
     if (select.value) {
-        // 从API获取想法详情
-        fetch('/api/incubator?per_page=1000')
-            .then(res => res.json())
-            .then(data => {
-                // 判断是分页结果还是列表结果
-                let ideas;
-                if (data.items && data.total !== undefined) {
-                    ideas = data.items;
-                } else {
-                    ideas = data;
-                }
-                
-                const idea = ideas.find(i => i.id == select.value);
-                if (idea) {
-                    ideaInput.value = idea.idea;
-                }
-            });
+        // 从共用的想法缓存中读取详情
+        getAllIdeas().then(({ byId }) => {
+            const idea = byId.get(select.value);
+            if (idea) {
+                ideaInput.value = idea.idea;
+            }
+        });
     }
 }
 
@@ -507,6 +723,7 @@ async function startExperiment(event) {
         
         if (result.success) {
             closeModal('start-experiment-modal');
+            invalidateIdeaCache();
             loadExperiments();
             loadIncubator();
             loadStats();
@@ -689,6 +906,7 @@ async function showArchiveDetail(archiveId) {
             </div>
         `;
         
+        currentExperimentId = null;
         showDetailPage();
     } catch (error) {
         alert('加载详情失败: ' + error.message);
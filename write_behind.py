@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+三分钟热情项目管理系统 - 进度记录写缓冲（write-behind）
+
+校验通过的进度记录先进入进程内队列并追加到本地溢写文件，立即向客户端确认；
+后台线程在队列达到 flush_size 条或每隔 flush_interval 秒时用一条多行INSERT批量写入数据库。
+进程崩溃后，下次启动会从溢写文件恢复尚未写入的记录；正常退出时会先刷新队列。
+
+溢写文件按进程独占使用，同一路径不要被多个进程共享，因此没有默认路径，必须由调用方显式指定。
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class ProgressNoteBuffer:
+    """进度记录写缓冲"""
+
+    def __init__(self, pm, spill_path: str, flush_size: int = 50, flush_interval: float = 2.0,
+                 validation_ttl: float = 60.0):
+        self.pm = pm
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self.validation_ttl = validation_ttl
+
+        self._lock = threading.Lock()          # 保护队列、溢写文件和统计数据
+        self._flush_lock = threading.Lock()    # 保证同一时间只有一个刷新在执行
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._pending = []                     # [{'project_id', 'note', 'created_at'}, ...]
+        self._flushing = []                    # 正在写入数据库的一批记录
+        self._validated = {}                   # {实验ID: 校验结果过期时间}
+
+        # 统计数据
+        self._started_at = time.time()
+        self._enqueued = 0
+        self._flushed = 0
+        self._dropped = 0
+        self._batches = 0
+        self._failed_flushes = 0
+        self._flush_seconds = 0.0
+        self._max_flush_seconds = 0.0
+        self._last_flush_seconds = None
+        self._last_flush_at = None
+        self._last_batch_size = 0
+
+        self._recover_spill()
+        self._thread = threading.Thread(target=self._run, name='progress-note-flusher', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ========== 入队 ==========
+
+    def enqueue(self, experiment_id: int, note: str):
+        """校验并缓冲一条进度记录，写入溢写文件后即返回"""
+        self._validate(experiment_id)
+        record = {
+            'project_id': experiment_id,
+            'note': note,
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        with self._lock:
+            self._append_spill(record)
+            self._pending.append(record)
+            self._enqueued += 1
+            full = len(self._pending) >= self.flush_size
+        if full:
+            self._wakeup.set()
+
+    def pending_notes(self, experiment_id: int) -> List[Dict]:
+        """返回某个实验尚未写入数据库（含正在刷新）的进度记录（与接口中progress_notes格式相同）"""
+        with self._lock:
+            records = self._flushing + self._pending
+        return [
+            {'date': record['created_at'], 'note': record['note']}
+            for record in records
+            if record['project_id'] == experiment_id
+        ]
+
+    def oldest_pending(self) -> Optional[datetime]:
+        """尚未写入数据库（含正在刷新）的记录中最早的created_at，没有时返回None"""
+        with self._lock:
+            records = self._pending + self._flushing
+        if not records:
+            return None
+        # created_at格式固定，字符串顺序即时间顺序
+        return datetime.strptime(min(record['created_at'] for record in records), '%Y-%m-%d %H:%M:%S')
+
+    def _validate(self, experiment_id: int):
+        """检查实验是否处于进行中，结果缓存validation_ttl秒，避免每条记录都查询数据库"""
+        now = time.time()
+        if self._validated.get(experiment_id, 0) > now:
+            return
+        if not self.pm.is_active_experiment(experiment_id):
+            raise ValueError(f"未找到ID为 {experiment_id} 的进行中实验")
+        self._validated[experiment_id] = now + self.validation_ttl
+
+    def forget(self, experiment_id: int):
+        """清除实验的校验缓存（实验完成后调用，之后的记录会重新校验）"""
+        self._validated.pop(experiment_id, None)
+
+    # ========== 刷新 ==========
+
+    def flush(self) -> int:
+        """把队列中的记录批量写入数据库，返回写入条数；写入失败时记录保留在队列中等待重试"""
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending
+                self._pending = []
+                self._flushing = batch
+            if not batch:
+                return 0
+
+            start = time.perf_counter()
+            try:
+                inserted = self.pm.add_progress_notes_batch([
+                    (record['project_id'], record['note'], record['created_at'])
+                    for record in batch
+                ])
+            except Exception as e:
+                # add_progress_notes_batch整批在一个事务中提交，抛出异常时没有记录被写入，整批放回队列不会重复
+                with self._lock:
+                    self._pending[:0] = batch
+                    self._flushing = []
+                    self._failed_flushes += 1
+                logger.error(f"刷新进度记录失败，{len(batch)} 条记录将稍后重试: {e}")
+                return 0
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self._flushing = []
+                self._rewrite_spill()
+                self._flushed += inserted
+                self._dropped += len(batch) - inserted
+                self._batches += 1
+                self._flush_seconds += elapsed
+                self._max_flush_seconds = max(self._max_flush_seconds, elapsed)
+                self._last_flush_seconds = elapsed
+                self._last_flush_at = datetime.now()
+                self._last_batch_size = len(batch)
+            return inserted
+
+    def _run(self):
+        """后台刷新线程：队列满或到达时间间隔时刷新"""
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"进度记录刷新线程异常: {e}")
+
+    def close(self):
+        """停止后台线程并刷新剩余记录（进程退出时自动调用）"""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+        with self._lock:
+            remaining = len(self._pending)
+        if remaining:
+            logger.warning(f"仍有 {remaining} 条进度记录未写入，已保留在溢写文件 {self.spill_path}")
+
+    # ========== 溢写文件 ==========
+
+    def _append_spill(self, record: Dict):
+        """追加一条记录到溢写文件并落盘（调用方持有self._lock）"""
+        with open(self.spill_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _rewrite_spill(self):
+        """用当前队列重写溢写文件（调用方持有self._lock）"""
+        if not self._pending:
+            if os.path.exists(self.spill_path):
+                os.remove(self.spill_path)
+            return
+        tmp_path = self.spill_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in self._pending:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.spill_path)
+
+    def _recover_spill(self):
+        """从溢写文件恢复上次未写入的记录"""
+        if not os.path.exists(self.spill_path):
+            return
+        recovered = []
+        with open(self.spill_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    recovered.append(json.loads(line))
+                except ValueError:
+                    # 崩溃时可能只写了半行
+                    logger.warning(f"跳过溢写文件中无法解析的行: {line!r}")
+        self._pending = recovered
+        if recovered:
+            logger.info(f"从溢写文件恢复 {len(recovered)} 条进度记录")
+
+    # ========== 统计 ==========
+
+    def stats(self) -> Dict:
+        """吞吐量和刷新延迟统计"""
+        with self._lock:
+            uptime = time.time() - self._started_at
+            return {
+                'enabled': True,
+                'pending': len(self._pending),
+                'enqueued': self._enqueued,
+                'flushed': self._flushed,
+                'dropped': self._dropped,
+                'batches': self._batches,
+                'failed_flushes': self._failed_flushes,
+                'flush_size': self.flush_size,
+                'flush_interval': self.flush_interval,
+                'last_batch_size': self._last_batch_size,
+                'last_flush_at': self._last_flush_at.strftime('%Y-%m-%d %H:%M:%S') if self._last_flush_at else None,
+                'last_flush_ms': round(self._last_flush_seconds * 1000, 2) if self._last_flush_seconds is not None else None,
+                'avg_flush_ms': round(self._flush_seconds * 1000 / self._batches, 2) if self._batches else None,
+                'max_flush_ms': round(self._max_flush_seconds * 1000, 2),
+                'enqueue_per_sec': round(self._enqueued / uptime, 2) if uptime > 0 else 0,
+                'flush_rows_per_sec': round(self._flushed / self._flush_seconds, 2) if self._flush_seconds > 0 else None
+            }